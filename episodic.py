@@ -2,12 +2,34 @@
 
 import os
 import re
+import errno
+import shutil
 import requests
-from urllib.parse import quote
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import quote, urljoin, urlparse, parse_qs
 from bs4 import BeautifulSoup
 import click
 import time
 import sys
+import json
+import hashlib
+import random
+import socket
+import socketserver
+import threading
+import multiprocessing
+import math
+from collections import deque
+from contextlib import contextmanager, ExitStack
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 # Color support
 try:
@@ -46,6 +68,140 @@ except ImportError:
 CONFIG_FILENAME = "rename_config.txt"
 SUPPORTED_EXTENSIONS = {'.mkv', '.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm'}
 
+IMDB_DEFAULT_URL = "https://www.imdb.com"
+IMDB_BASE_URL = os.environ.get('EPISODIC_IMDB_URL', IMDB_DEFAULT_URL).rstrip('/')
+HTTP_RETRIES = 3
+HTTP_POOL_SIZE = 16
+HTTP_TIMEOUT = 15
+
+# Hedged requests: a duplicate is sent once a request takes longer than a percentile
+# of the latencies of the last LATENCY_WINDOW requests (after HEDGE_MIN_SAMPLES of them)
+LATENCY_WINDOW = 200
+HEDGE_MIN_SAMPLES = 8
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Selectors for episode titles, tried in order
+EPISODE_SELECTORS = [
+    "div.info strong a",
+    "div.info h4 a", 
+    "h4 a",
+    ".episode-item-wrapper .info strong a",
+    ".episode-item .info strong a",
+    "article h4 a",
+    ".titleColumn a"
+]
+# Links to the next page of a long season ("load more" / pagination)
+NEXT_PAGE_SELECTOR = 'a#load_next_episodes, a[rel="next"], a[data-testid="pagination-next"]'
+EPISODES_PAGE_SIZE = 50
+MAX_EPISODE_PAGES = 40
+
+# Season folder names, decided in a single match:
+# "1", "Season 1", "Season01", "Show.S01.1080p", "1 сезон" (not "Samples", "Subs", "Extras")
+SEASON_FOLDER_RE = re.compile(r"""
+    ^(\d{1,2})$
+  | (?<![a-z0-9])(?:season|saison|staffel|сезон)[\s._-]*(\d{1,2})(?!\d)
+  | (?<![a-z0-9])s(\d{1,2})(?!\d)
+  | (?<![a-z0-9])(\d{1,2})[\s._-]*сезон
+""", re.IGNORECASE | re.VERBOSE)
+
+# Disc folders inside a season folder (Season 1/Disc 2)
+DISC_FOLDER_RE = re.compile(r'^(?:disc|disk|cd|dvd|part)[\s._-]*\d{1,2}$', re.IGNORECASE)
+
+# Series/Season/Disc - how deep the season walker looks below a series folder
+SEASON_WALK_MAX_DEPTH = 2
+
+# Patterns are compiled once so long-running processes (--serve) reuse them
+# Common patterns for season detection from file names
+FILE_SEASON_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
+    r'S(\d{1,2})',           # S01, S1, S12
+    r'Season\s*(\d{1,2})',   # Season 1, Season01
+    r'(\d{1,2})x\d{1,2}',    # 1x01, 12x05
+    r'(\d{1,2})\.\d{1,2}',   # 1.01, 12.05
+    r'(\d{1,2})-\d{1,2}',    # 1-01, 12-05
+]]
+
+# Patterns that suggest double episodes
+DOUBLE_EPISODE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
+    r'S\d{1,2}E(\d{1,2})E(\d{1,2})', # S03E01E02 (most specific first)
+    r'E(\d{1,2})E(\d{1,2})',     # E01E02
+    r'E(\d{1,2})-E(\d{1,2})',    # E01-E02
+    r'(\d{1,2})x(\d{1,2})',      # 1x01-02
+    r'(\d{1,2})-(\d{1,2})',      # 1-01-02
+    r'Ep(\d{1,2})-(\d{1,2})',    # Ep01-02
+    r'Episode(\d{1,2})-(\d{1,2})', # Episode01-02
+    r'ep(\d{1,2})-E(\d{1,2})',   # ep1-E02
+    r'(\d{1,2})-E(\d{1,2})',     # 1-E02
+    # Removed (\d{1,2})E(\d{1,2}) as it's too generic and matches S06E01
+]]
+
+# Episode numbers in file names: S01E05, S01E05E06, S01E05-E06, 1x05, 1x05-06, E05, Ep 05-06,
+# Episode 05, "Show - 05 [1080p]"
+EPISODE_NUMBER_RE = re.compile(r"""
+    (?<![a-z0-9])s(?P<season>\d{1,2})[\s._-]*e(?P<first>\d{1,3})(?P<last>(?:(?:-?e|-)\d{1,3})+)?
+  | (?<![a-z0-9])(?P<season_x>\d{1,2})x(?P<first_x>\d{1,3})(?:-(?:\d{1,2}x)?(?P<last_x>\d{1,3}))?
+  | (?<![a-z0-9])(?:e|ep|episode)[\s._-]*(?P<first_e>\d{1,3})(?P<last_e>(?:(?:[\s._]*-[\s._]*(?:e|ep)?|e)\d{1,3})+)?(?!\d)
+  | \s-\s(?P<first_dash>\d{1,3})(?:-(?P<last_dash>\d{1,3}))?(?=[\s.\[(v]|$)
+""", re.IGNORECASE | re.VERBOSE)
+
+# Specials are left alone instead of shifting the regular episodes. Next to an
+# episode marker only the token right before it counts ("Show.Special.E01"), so
+# "Special.Victims.Unit.S01E05" and "S01E02.Special.Edition" stay regular episodes
+SPECIAL_EPISODE_RE = re.compile(r'(?<![a-z])(?:specials?|sp\d{1,2}|ova)(?![a-z])', re.IGNORECASE)
+SPECIAL_MARKER_RE = re.compile(r'(?<![a-z])(?:specials?|ova)[\s._-]*$', re.IGNORECASE)
+MAX_EPISODES_PER_FILE = 4
+
+SERVE_DEFAULT_PORT = 8765
+
+# Provider routing: weight of the newest sample, and when to stop preferring a failing provider
+PROVIDER_EWMA_ALPHA = 0.3
+PROVIDER_MAX_ERRORS = 3
+PROVIDER_COOLDOWN = 60
+
+# Seasons whose titles are fetched at the same time in --all-seasons runs
+TITLE_FETCH_WORKERS = 4
+
+# Seconds fetched season titles are reused for (new episodes get listed over time)
+TITLES_CACHE_TTL = 6 * 3600
+
+_HTTP_SESSION = None
+_PARSE_POOL = None
+_PARSE_WORKERS = 0
+_HEDGE_PERCENTILE = None
+_HEDGE_POOL = None
+_LATENCIES = deque(maxlen=LATENCY_WINDOW)
+_LATENCY_LOCK = threading.Lock()
+_RUN_DEADLINE = None
+MERGED_REPORT_FILENAME = "episodic-merged.json"
+
+# ioctl request for copy-on-write clones on Linux (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# Rename journal: where runs are recorded, and how many entries may be written between fsyncs
+JOURNAL_DIR = os.path.join(os.path.expanduser('~'), '.episodic', 'journal')
+JOURNAL_SYNC_EVERY = 64
+
+# Recorded IMDB pages for the stand-in server
+FIXTURE_INDEX_FILENAME = "index.json"
+
+# Per-folder advisory locks taken while renaming: lock file name, seconds to wait for a
+# locked folder, and age after which a lock held from another host is considered stale
+LOCK_FILENAME = ".episodic.lock"
+LOCK_TIMEOUT = 30
+LOCK_POLL_INTERVAL = 0.2
+LOCK_STALE_AFTER = 6 * 3600
+
+_METADATA_ROUTER = None
+_TITLES_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
 def clear_screen():
     """Clear the terminal screen"""
     os.system('cls' if os.name == 'nt' else 'clear')
@@ -89,21 +245,13 @@ def highlight_echo(message):
     """Print highlighted message in cyan"""
     colored_echo(message, Fore.CYAN, Style.BRIGHT)
 
-def find_show_on_imdb(show):
+def find_show_on_imdb(show, raise_errors=False):
     """Find show URL on IMDB"""
-    search_url = f"https://www.imdb.com/find/?q={quote(show)}&s=tt&ttype=tv"
+    search_url = f"{IMDB_BASE_URL}/find/?q={quote(show)}&s=tt&ttype=tv"
     
     try:
         info_echo(f"🔍 Searching for '{show}' on IMDB...")
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        response = requests.get(search_url, headers=headers, timeout=15)
+        response = http_get(search_url)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, "html.parser")
@@ -136,7 +284,7 @@ def find_show_on_imdb(show):
                 href = link.get("href", "")
                 if "/title/" in href:
                     if not href.startswith("http"):
-                        show_url = "https://www.imdb.com" + href
+                        show_url = IMDB_BASE_URL + href
                     else:
                         show_url = href
                     
@@ -150,168 +298,745 @@ def find_show_on_imdb(show):
         error_echo("❌ No valid show found in results")
         return None
         
+    except DeadlineExceeded:
+        if raise_errors:
+            raise
+        return None
     except Exception as e:
         error_echo(f"❌ Error searching IMDB: {e}")
+        if raise_errors:
+            raise
         return None
 
-def get_episode_titles(show_url, season):
-    """Get episode titles for a specific season using existing show URL"""
+class DeadlineExceeded(requests.Timeout):
+    """Raised when a request can't finish before the run deadline (not a provider failure)"""
+
+class DeadlineRetry(Retry):
+    """Retries that stop, and back off no longer than, the run deadline allows"""
+    
+    def is_exhausted(self):
+        return super().is_exhausted() or time_left() == 0
+    
+    def get_backoff_time(self):
+        return _within_deadline(super().get_backoff_time())
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return _within_deadline(retry_after) if retry_after is not None else None
+
+def _within_deadline(seconds):
+    remaining = time_left()
+    return seconds if remaining is None else min(seconds, remaining)
+
+def get_http_session():
+    """Get the shared HTTP session (keeps connections to IMDB alive between pages)"""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        _HTTP_SESSION = requests.Session()
+        _HTTP_SESSION.headers.update(REQUEST_HEADERS)
+        # Back off and retry on throttling (429, honouring Retry-After) and server errors
+        retries = DeadlineRetry(total=HTTP_RETRIES, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(max_retries=retries, pool_maxsize=HTTP_POOL_SIZE)
+        _HTTP_SESSION.mount("http://", adapter)
+        _HTTP_SESSION.mount("https://", adapter)
+    return _HTTP_SESSION
+
+def configure_hedging(percentile):
+    """Hedge page requests slower than this percentile of recent latency (None turns hedging off)"""
+    global _HEDGE_PERCENTILE, _HEDGE_POOL
+    _HEDGE_PERCENTILE = percentile
+    if percentile and _HEDGE_POOL is None:
+        # Room for a request and its duplicate from every fetching thread
+        _HEDGE_POOL = ThreadPoolExecutor(max_workers=2 * max(HTTP_POOL_SIZE, _PARSE_WORKERS))
+
+def set_run_deadline(seconds):
+    """Stop waiting for IMDB after this many seconds from now (None for no deadline)"""
+    global _RUN_DEADLINE
+    _RUN_DEADLINE = time.monotonic() + seconds if seconds is not None else None
+
+def time_left():
+    """Seconds until the run deadline, or None without one"""
+    if _RUN_DEADLINE is None:
+        return None
+    return max(0.0, _RUN_DEADLINE - time.monotonic())
+
+def wait_within_deadline(future):
+    """Result of a future, or None if the run deadline passes first"""
     try:
-        # Get episodes for the season
-        episodes_url = f"{show_url}episodes/?season={season}"
-        click.echo(f"🔍 Getting episodes for season {season}...")
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
+        return future.result(timeout=time_left())
+    except (FuturesTimeout, DeadlineExceeded):
+        return None
+
+def hedge_delay():
+    """How long to wait before hedging a request, or None while there are too few samples"""
+    with _LATENCY_LOCK:
+        if len(_LATENCIES) < HEDGE_MIN_SAMPLES:
+            return None
+        latencies = sorted(_LATENCIES)
+    return latencies[max(0, math.ceil(_HEDGE_PERCENTILE / 100 * len(latencies)) - 1)]
+
+def _timed_get(url, timeout):
+    started = time.perf_counter()
+    try:
+        response = get_http_session().get(url, timeout=timeout)
+    except requests.RequestException as e:
+        if time_left() == 0:
+            # Cut short by the deadline rather than by the site
+            raise DeadlineExceeded(f"Run deadline reached while fetching {url}") from e
+        raise
+    with _LATENCY_LOCK:
+        _LATENCIES.append(time.perf_counter() - started)
+    return response
+
+def _close_response(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+def http_get(url):
+    """GET a page with the shared session, hedging slow requests and honouring the run deadline"""
+    timeout = HTTP_TIMEOUT
+    remaining = time_left()
+    if remaining is not None:
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Run deadline reached before {url}")
+        timeout = min(timeout, remaining)
+    
+    delay = hedge_delay() if _HEDGE_PERCENTILE else None
+    if delay is None:
+        return _timed_get(url, timeout)
+    
+    primary = _HEDGE_POOL.submit(_timed_get, url, timeout)
+    try:
+        return primary.result(timeout=delay)
+    except FuturesTimeout:
+        pass
+    
+    # Slower than usual: race a duplicate request, the first good response wins
+    pending = {primary, _HEDGE_POOL.submit(_timed_get, url, timeout)}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                response = future.result()
+            except Exception as e:
+                error = e
+                continue
+            for other in pending:
+                if not other.cancel():
+                    other.add_done_callback(_close_response)
+            return response
+    raise error
+
+def set_imdb_base_url(url):
+    """Send IMDB requests to another host, e.g. a local stand-in"""
+    global IMDB_BASE_URL
+    IMDB_BASE_URL = url.rstrip('/')
+
+def set_lock_timeout(seconds):
+    """How long renames wait for a folder locked by another run"""
+    global LOCK_TIMEOUT
+    LOCK_TIMEOUT = seconds
+
+def clean_episode_title(title):
+    """Strip episode numbering prefixes from a scraped title"""
+    title = re.sub(r'^S\d+\.E\d+\s*∙\s*', '', title)  # Remove S1.E1 ∙
+    title = re.sub(r'^\d+\.\s*', '', title)  # Remove "1. "
+    title = re.sub(r'^Episode\s+\d+:\s*', '', title, flags=re.IGNORECASE)  # Remove "Episode 1: "
+    return title.strip()
+
+def extract_episode_links(soup):
+    """Find episode title links on an episodes page, returns (selector, [(key, title)])"""
+    for selector in EPISODE_SELECTORS:
+        episode_links = soup.select(selector)
+        if episode_links:
+            episodes = []
+            for link in episode_links:
+                title = link.get_text(strip=True)
+                if title and len(title) > 1:
+                    title = clean_episode_title(title)
+                    if title:
+                        episodes.append((link.get("href", "").split("?")[0] or title, title))
+            return selector, episodes
+    
+    # Alternative: try to find episode titles in different structure
+    episodes = []
+    for link in soup.find_all("a"):
+        href = link.get("href", "")
+        if "/title/" in href and "season-" in href.lower():
+            title = link.get_text(strip=True)
+            if title and len(title) > 2 and not title.isdigit():
+                title = clean_episode_title(title)
+                if title:
+                    episodes.append((href.split("?")[0], title))
+    return None, episodes
+
+def find_next_episodes_page(soup, episodes_url, page, page_full):
+    """Get URL of the next episodes page, or None if this was the last one"""
+    link = soup.select_one(NEXT_PAGE_SELECTOR)
+    if link and link.get("href"):
+        return urljoin(episodes_url, link["href"])
+    if page_full:
+        # No explicit link, but the page is full - ask for the next one
+        return f"{episodes_url}&page={page + 1}"
+    return None
+
+def parse_episodes_page(html, episodes_url, page):
+    """Parse an episodes page, returns (selector, [(key, title)], next page URL)"""
+    soup = BeautifulSoup(html, "html.parser")
+    selector, episodes = extract_episode_links(soup)
+    next_url = find_next_episodes_page(soup, episodes_url, page, len(episodes) >= EPISODES_PAGE_SIZE)
+    return selector, episodes, next_url
+
+def parse_seasons_page(html):
+    """Parse the season numbers out of an episodes page"""
+    soup = BeautifulSoup(html, "html.parser")
+    seasons = set()
+    for option in soup.select("select#bySeason option"):
+        if option.get("value", "").isdigit():
+            seasons.add(int(option["value"]))
+    for link in soup.find_all("a", href=True):
+        match = re.search(r'[?&]season=(\d+)', link["href"])
+        if match:
+            seasons.add(int(match.group(1)))
+    return sorted(seasons)
+
+def configure_parse_pool(workers=None):
+    """Parse downloaded pages in worker processes (one per CPU by default), returns the pool size"""
+    global _PARSE_POOL, _PARSE_WORKERS
+    _PARSE_WORKERS = workers or os.cpu_count() or 1
+    # Spawned workers don't inherit locks held by this process's fetch threads
+    _PARSE_POOL = ProcessPoolExecutor(max_workers=_PARSE_WORKERS,
+                                      mp_context=multiprocessing.get_context('spawn'))
+    return _PARSE_WORKERS
+
+def parse_page(parser, *args):
+    """Run a page parser in the parse pool if there is one, only its compact result comes back"""
+    if _PARSE_POOL is None:
+        return parser(*args)
+    return _PARSE_POOL.submit(parser, *args).result()
+
+def iter_episode_titles(show_url, season, raise_errors=False):
+    """Yield episode titles for a season page by page, following pagination"""
+    episodes_url = f"{show_url}episodes/?season={season}"
+    click.echo(f"🔍 Getting episodes for season {season}...")
+    
+    seen = set()
+    page_url = episodes_url
+    page = 1
+    found = 0
+    
+    while page_url and page <= MAX_EPISODE_PAGES:
+        try:
+            response = http_get(page_url)
+            response.raise_for_status()
+            selector, episodes, next_url = parse_page(parse_episodes_page, response.text, episodes_url, page)
+        except DeadlineExceeded:
+            # The caller reports the season as deferred
+            if raise_errors:
+                raise
+            return
+        except requests.RequestException as e:
+            error_echo(f"❌ Network error: {e}")
+            if raise_errors:
+                raise
+            break
+        except Exception as e:
+            error_echo(f"❌ Parsing error: {e}")
+            if raise_errors:
+                raise
+            break
         
-        response = requests.get(episodes_url, headers=headers, timeout=15)
-        response.raise_for_status()
+        if selector and page == 1:
+            click.echo(f"🎯 Using selector: {selector}")
         
-        soup = BeautifulSoup(response.text, "html.parser")
+        new_titles = 0
+        for key, title in episodes:
+            if key in seen:
+                continue
+            seen.add(key)
+            new_titles += 1
+            found += 1
+            yield title
         
-        titles = []
-        
-        # Try multiple selectors for episode titles
-        episode_selectors = [
-            "div.info strong a",
-            "div.info h4 a", 
-            "h4 a",
-            ".episode-item-wrapper .info strong a",
-            ".episode-item .info strong a",
-            "article h4 a",
-            ".titleColumn a"
-        ]
-        
-        for selector in episode_selectors:
-            episode_links = soup.select(selector)
-            if episode_links:
-                click.echo(f"🎯 Using selector: {selector}")
-                for link in episode_links:
-                    title = link.get_text(strip=True)
-                    if title and len(title) > 1:
-                        # Clean up title - remove episode numbers and extra formatting
-                        title = re.sub(r'^S\d+\.E\d+\s*∙\s*', '', title)  # Remove S1.E1 ∙
-                        title = re.sub(r'^\d+\.\s*', '', title)  # Remove "1. "
-                        title = re.sub(r'^Episode\s+\d+:\s*', '', title, flags=re.IGNORECASE)  # Remove "Episode 1: "
-                        title = title.strip()
-                        if title:
-                            titles.append(title)
-                break
+        if not new_titles:
+            # Empty page or the site ignored the page parameter
+            break
+        if page > 1:
+            info_echo(f"📄 Page {page}: {new_titles} more titles")
         
-        # Alternative: try to find episode titles in different structure
-        if not titles:
-            # Look for any links that might be episode titles
-            all_links = soup.find_all("a")
-            for link in all_links:
-                href = link.get("href", "")
-                if "/title/" in href and "season-" in href.lower():
-                    title = link.get_text(strip=True)
-                    if title and len(title) > 2 and not title.isdigit():
-                        # Clean up title
-                        title = re.sub(r'^S\d+\.E\d+\s*∙\s*', '', title)
-                        title = re.sub(r'^\d+\.\s*', '', title)
-                        title = re.sub(r'^Episode\s+\d+:\s*', '', title, flags=re.IGNORECASE)
-                        title = title.strip()
-                        if title:
-                            titles.append(title)
-        
-        if titles:
-            success_echo(f"✅ Found {len(titles)} episode titles")
-            return titles[:50]  # Limit to reasonable number
-        else:
-            error_echo("❌ No episodes found for this season")
-            warning_echo("🔧 Try checking if the season number is correct")
-            return []
-            
-    except requests.RequestException as e:
-        error_echo(f"❌ Network error: {e}")
+        page_url = next_url
+        page += 1
+    
+    if found:
+        success_echo(f"✅ Found {found} episode titles")
+    else:
+        error_echo("❌ No episodes found for this season")
+        warning_echo("🔧 Try checking if the season number is correct")
+
+def get_episode_titles(show_url, season):
+    """Get episode titles for a specific season using existing show URL"""
+    return list(iter_episode_titles(show_url, season))
+
+def get_imdb_seasons(show_url, raise_errors=False):
+    """Get the season numbers listed on a show's IMDB episodes page"""
+    try:
+        response = http_get(f"{show_url}episodes/")
+        response.raise_for_status()
+        return parse_page(parse_seasons_page, response.text)
+    except DeadlineExceeded:
+        if raise_errors:
+            raise
         return []
     except Exception as e:
-        error_echo(f"❌ Parsing error: {e}")
+        error_echo(f"❌ Error getting seasons from IMDB: {e}")
+        if raise_errors:
+            raise
+        return []
+
+class ProviderError(Exception):
+    """Raised by a metadata provider when a lookup fails (as opposed to finding nothing)"""
+
+class TruncatedSeasonError(ProviderError):
+    """Raised by the router when a provider fails after some of a season's titles were yielded"""
+    
+    def __init__(self, provider, error):
+        super().__init__(f"Provider '{provider}' failed mid-season: {error}")
+        self.provider = provider
+
+class MetadataProvider:
+    """Source of show metadata.
+    
+    Providers resolve a show name to their own show reference (URL, ID, ...)
+    which is then passed back to list_seasons() and iter_episode_titles().
+    Return None or an empty result when nothing is found, and raise on
+    failures so the router can fall back to another provider.
+    """
+    name = None
+    
+    def resolve_show(self, show):
+        raise NotImplementedError
+    
+    def list_seasons(self, show_ref):
+        raise NotImplementedError
+    
+    def iter_episode_titles(self, show_ref, season):
+        raise NotImplementedError
+
+class IMDBProvider(MetadataProvider):
+    """Scrapes IMDB search and episodes pages"""
+    name = 'imdb'
+    
+    def resolve_show(self, show):
+        return find_show_on_imdb(show, raise_errors=True)
+    
+    def list_seasons(self, show_ref):
+        return get_imdb_seasons(show_ref, raise_errors=True)
+    
+    def iter_episode_titles(self, show_ref, season):
+        return iter_episode_titles(show_ref, season, raise_errors=True)
+
+class StubProvider(MetadataProvider):
+    """Serves shows from a local JSON file, for offline testing and benchmarks.
+    
+    File format:
+        {
+            "latency_ms": 0,
+            "error_rate": 0.0,
+            "shows": {
+                "Breaking Bad": {"seasons": {"1": ["Pilot", "Cat's in the Bag..."]}}
+            }
+        }
+    
+    latency_ms and error_rate are optional and simulate a slow or flaky provider.
+    """
+    name = 'stub'
+    
+    def __init__(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.path = path
+        self.latency = data.get('latency_ms', 0) / 1000
+        self.error_rate = data.get('error_rate', 0.0)
+        self.shows = {name.strip().lower(): info for name, info in data.get('shows', {}).items()}
+    
+    def _simulate(self):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and random.random() < self.error_rate:
+            raise ProviderError(f"Simulated failure in {self.path}")
+    
+    def resolve_show(self, show):
+        self._simulate()
+        key = show.strip().lower()
+        return key if key in self.shows else None
+    
+    def list_seasons(self, show_ref):
+        self._simulate()
+        return sorted(int(s) for s in self.shows[show_ref].get('seasons', {}))
+    
+    def iter_episode_titles(self, show_ref, season):
+        self._simulate()
+        return iter(self.shows[show_ref].get('seasons', {}).get(str(season), []))
+
+class ProviderStats:
+    """Observed latency and error rate of one provider (exponentially weighted)"""
+    
+    def __init__(self):
+        self.calls = 0
+        self.latency = None
+        self.error_rate = 0.0
+        self.consecutive_errors = 0
+        self.last_error = 0.0
+    
+    def record(self, elapsed, failed):
+        self.calls += 1
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency += PROVIDER_EWMA_ALPHA * (elapsed - self.latency)
+        self.error_rate += PROVIDER_EWMA_ALPHA * ((1.0 if failed else 0.0) - self.error_rate)
+        if failed:
+            self.consecutive_errors += 1
+            self.last_error = time.monotonic()
+        else:
+            self.consecutive_errors = 0
+    
+    def healthy(self):
+        if self.consecutive_errors < PROVIDER_MAX_ERRORS:
+            return True
+        # Give a failing provider another chance after the cooldown
+        return time.monotonic() - self.last_error > PROVIDER_COOLDOWN
+    
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'latency_ms': round(self.latency * 1000, 2) if self.latency is not None else None,
+            'error_rate': round(self.error_rate, 3),
+            'healthy': self.healthy(),
+        }
+
+class MetadataRouter:
+    """Routes lookups to the fastest healthy provider, falling back on failure"""
+    
+    def __init__(self, providers):
+        self.providers = list(providers)
+        self.stats = {provider.name: ProviderStats() for provider in self.providers}
+        self._refs = {}
+        self._lock = threading.Lock()
+    
+    def ranked(self):
+        """Providers ordered by health, then observed latency and error rate, then configured order"""
+        def score(item):
+            index, provider = item
+            stats = self.stats[provider.name]
+            # Expected time to a good answer if failures were retried; providers not
+            # measured yet keep their configured order behind the measured ones
+            if stats.latency is None:
+                expected = float('inf')
+            else:
+                expected = stats.latency / max(1.0 - stats.error_rate, 0.05)
+            return (not stats.healthy(), expected, index)
+        with self._lock:
+            return [provider for _, provider in sorted(enumerate(self.providers), key=score)]
+    
+    def _record(self, provider, elapsed, failed):
+        with self._lock:
+            self.stats[provider.name].record(elapsed, failed)
+    
+    def _call(self, provider, func, *args):
+        started = time.perf_counter()
+        try:
+            result = func(*args)
+        except DeadlineExceeded:
+            # Running out of time says nothing about the provider
+            raise
+        except Exception:
+            self._record(provider, time.perf_counter() - started, True)
+            raise
+        self._record(provider, time.perf_counter() - started, False)
+        return result
+    
+    def _show_ref(self, provider, show):
+        key = (provider.name, show.strip().lower())
+        with self._lock:
+            if key in self._refs:
+                return self._refs[key]
+        show_ref = self._call(provider, provider.resolve_show, show)
+        if show_ref:
+            with self._lock:
+                self._refs[key] = show_ref
+        return show_ref
+    
+    def resolve_show(self, show):
+        """Resolve a show, returns (provider name, show reference) or None"""
+        for provider in self.ranked():
+            try:
+                show_ref = self._show_ref(provider, show)
+            except DeadlineExceeded:
+                return None
+            except Exception as e:
+                warning_echo(f"⚠️ Provider '{provider.name}' failed: {e}")
+                continue
+            if show_ref:
+                return provider.name, show_ref
+        return None
+    
+    def list_seasons(self, show):
+        """Season numbers of a show from the first provider that knows them"""
+        for provider in self.ranked():
+            try:
+                show_ref = self._show_ref(provider, show)
+                seasons = self._call(provider, provider.list_seasons, show_ref) if show_ref else None
+            except DeadlineExceeded:
+                return []
+            except Exception as e:
+                warning_echo(f"⚠️ Provider '{provider.name}' failed: {e}")
+                continue
+            if seasons:
+                return seasons
         return []
+    
+    def iter_episode_titles(self, show, season, exclude=()):
+        """Yield episode titles for a season, falling back until a provider returns some.
+        
+        Raises DeadlineExceeded when the run deadline cuts the lookup short, and
+        TruncatedSeasonError when a provider fails after its first titles.
+        """
+        for provider in self.ranked():
+            if provider.name in exclude:
+                continue
+            try:
+                # A failed lookup is already recorded by _call()
+                show_ref = self._show_ref(provider, show)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                warning_echo(f"⚠️ Provider '{provider.name}' failed: {e}")
+                continue
+            if not show_ref:
+                continue
+            
+            started = time.perf_counter()
+            try:
+                titles = iter(provider.iter_episode_titles(show_ref, season))
+                first = next(titles, None)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                self._record(provider, time.perf_counter() - started, True)
+                warning_echo(f"⚠️ Provider '{provider.name}' failed: {e}")
+                continue
+            # Time to the first title is what ranks providers for streamed lookups
+            self._record(provider, time.perf_counter() - started, False)
+            if first is None:
+                continue
+            
+            yield first
+            try:
+                for title in titles:
+                    yield title
+            except DeadlineExceeded:
+                # A cut-short season must not pass for a complete one
+                raise
+            except Exception as e:
+                self._record(provider, time.perf_counter() - started, True)
+                raise TruncatedSeasonError(provider.name, e) from e
+            return
+    
+    def episode_titles(self, show, season):
+        """Get all episode titles for a season as a list (empty unless a provider had them all)"""
+        failed = set()
+        while True:
+            try:
+                return list(self.iter_episode_titles(show, season, exclude=failed))
+            except TruncatedSeasonError as e:
+                # Part of a season would pass for all of it, ask the next provider instead
+                warning_echo(f"⚠️ {e}")
+                failed.add(e.provider)
+    
+    def report(self):
+        """Current stats of every provider"""
+        with self._lock:
+            return {provider.name: self.stats[provider.name].as_dict() for provider in self.providers}
+
+def configure_providers(names, stub_file=None):
+    """Set up the metadata router from a comma-separated provider list"""
+    global _METADATA_ROUTER
+    providers = []
+    for name in [n.strip().lower() for n in names.split(',') if n.strip()]:
+        if name == 'imdb':
+            providers.append(IMDBProvider())
+        elif name == 'stub':
+            if not stub_file:
+                raise click.BadParameter("the 'stub' provider needs --stub-file")
+            providers.append(StubProvider(stub_file))
+        else:
+            raise click.BadParameter(f"unknown provider '{name}' (available: imdb, stub)")
+    if not providers:
+        raise click.BadParameter("at least one provider is required")
+    _METADATA_ROUTER = MetadataRouter(providers)
+    return _METADATA_ROUTER
+
+def get_metadata_router():
+    """Get the metadata router (IMDB only unless configured otherwise)"""
+    global _METADATA_ROUTER
+    if _METADATA_ROUTER is None:
+        _METADATA_ROUTER = MetadataRouter([IMDBProvider()])
+    return _METADATA_ROUTER
+
+def resolve_show(show):
+    """Resolve a show with the configured providers, returns (provider, show reference) or None"""
+    return get_metadata_router().resolve_show(show)
+
+def prefetch_season_titles(show, seasons, workers=None):
+    """Start fetching the titles of several seasons concurrently, returns {season: future}"""
+    if not seasons:
+        return {}
+    # With a parse pool, fetch enough seasons at once to keep every worker process busy
+    workers = workers or max(TITLE_FETCH_WORKERS, _PARSE_WORKERS)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(seasons))))
+    futures = {season: executor.submit(fetch_season_titles, show, season) for season in seasons}
+    executor.shutdown(wait=False)
+    return futures
+
+def fetch_season_titles(show, season):
+    """Get episode titles for a season, remembering complete results for TITLES_CACHE_TTL seconds"""
+    key = (show.strip().lower(), season)
+    with _CACHE_LOCK:
+        cached = _TITLES_CACHE.get(key)
+        if cached and time.monotonic() - cached[0] < TITLES_CACHE_TTL:
+            return cached[1]
+    titles = get_metadata_router().episode_titles(show, season)
+    if titles:
+        with _CACHE_LOCK:
+            _TITLES_CACHE[key] = (time.monotonic(), titles)
+    return titles
+
+def scan_folder(folder_path):
+    """List a folder once, returns (subfolder names, video file names)"""
+    folders = []
+    files = []
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                folders.append(entry.name)
+            elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTENSIONS:
+                files.append(entry.name)
+    return sorted(folders), sorted(files)
 
 def get_video_files(folder_path):
     if not os.path.exists(folder_path):
         click.echo(f"❌ Folder does not exist: {folder_path}")
         return []
     
-    files = []
-    for f in os.listdir(folder_path):
-        if os.path.isfile(os.path.join(folder_path, f)):
-            ext = os.path.splitext(f)[1].lower()
-            if ext in SUPPORTED_EXTENSIONS:
-                files.append(f)
-    
-    return sorted(files)
+    return scan_folder(folder_path)[1]
+
+def classify_season_folder(folder_name):
+    """Season number of a season folder name, or None if it is not one"""
+    match = SEASON_FOLDER_RE.search(folder_name)
+    if match:
+        season_num = int(next(group for group in match.groups() if group))
+        if 1 <= season_num <= 99:
+            return season_num
+    return None
+
+def get_season_files(season_path, max_depth=SEASON_WALK_MAX_DEPTH - 1):
+    """Get video files of a season folder, including disc subfolders (Disc 1, CD2, ...)"""
+    folders, files = scan_folder(season_path)
+    if max_depth > 0:
+        for folder in folders:
+            # Only descend into disc/part folders, never into extras or subtitles
+            if DISC_FOLDER_RE.match(folder):
+                nested = get_season_files(os.path.join(season_path, folder), max_depth - 1)
+                files.extend(os.path.join(folder, f) for f in nested)
+    return files
 
 def get_season_folders(series_path):
     """Get list of season folders in series directory"""
     if not os.path.exists(series_path):
         return []
     
-    season_folders = []
-    for item in os.listdir(series_path):
-        item_path = os.path.join(series_path, item)
-        if os.path.isdir(item_path):
-            # Check if folder name suggests it's a season
-            if any(pattern in item.lower() for pattern in ['season', 's', 'сезон']):
-                season_folders.append(item)
-    
-    return sorted(season_folders)
+    folders, _ = scan_folder(series_path)
+    return [folder for folder in folders if classify_season_folder(folder)]
 
-def get_all_episodes_from_series(series_path):
-    """Get all episodes from all season folders"""
-    season_folders = get_season_folders(series_path)
+def get_all_episodes_from_series(series_path, skip_folders=None):
+    """Get all episodes from all season folders (except skip_folders, given as absolute paths)"""
+    if not os.path.exists(series_path):
+        click.echo(f"❌ Folder does not exist: {series_path}")
+        return [], None
     
-    if not season_folders:
-        # If no season folders, treat as single season
-        return get_video_files(series_path), None
+    # One listing of the series folder serves both the season and the flat layout
+    folders, series_files = scan_folder(series_path)
     
     all_files = []
     season_mapping = {}
+    resumed = False
     
-    for season_folder in season_folders:
-        season_path = os.path.join(series_path, season_folder)
-        files = get_video_files(season_path)
+    for season_folder in folders:
+        season_num = classify_season_folder(season_folder)
+        if not season_num:
+            # Extras, Subs, Samples, ... are never listed
+            continue
         
+        season_path = os.path.join(series_path, season_folder)
+        if skip_folders and (os.path.abspath(season_path) in skip_folders or
+                             season_scope(series_path, season_num, flat=True) in skip_folders):
+            # Finished earlier in a resumed run (also when split out of a flat folder), no need to list it again
+            resumed = True
+            continue
+        files = get_season_files(season_path)
         if files:
-            # Detect season number from folder name
-            season_num = detect_season_from_folder_name(season_folder)
-            if season_num:
-                season_mapping[season_num] = {
-                    'path': season_path,
-                    'files': files
-                }
-                all_files.extend(files)
+            season_mapping[season_num] = {
+                'path': season_path,
+                'files': files
+            }
+            all_files.extend(files)
+    
+    # Episodes lying in the series folder itself are split by the season in their names:
+    # a flat folder holding several seasons, or seasons not moved into folders yet
+    buckets, unmarked = group_files_by_season(series_files)
+    if buckets and (season_mapping or resumed or len(buckets) > 1):
+        for f in unmarked:
+            # Samples, trailers, ... can't be placed in a season
+            warning_echo(f"⚠️ Leaving out {f}: no season in its name")
+        for season_num, files in sorted(buckets.items()):
+            if season_num in season_mapping:
+                continue
+            if skip_folders and season_scope(series_path, season_num, flat=True) in skip_folders:
+                continue
+            season_mapping[season_num] = {
+                'path': series_path,
+                'files': files,
+                'flat': True
+            }
+            all_files.extend(files)
     
     # If no valid season folders found, treat as single season
     if not season_mapping:
-        return get_video_files(series_path), None
+        return series_files, None
     
     return all_files, season_mapping
 
+def place_in_season_folder(mapping, season):
+    """Send renamed files of one season of a flat folder into its own Season N folder"""
+    return {old: os.path.join(f"Season {season}", new) if new else new for old, new in mapping.items()}
+
+def group_files_by_season(files):
+    """Bucket the files of a flat folder by the season in their names, returns (buckets, files without one)"""
+    buckets = {}
+    unmarked = []
+    for f in files:
+        record = parse_episode_file(f)
+        if record is None or record.season is None:
+            unmarked.append(f)
+        elif not record.special:
+            buckets.setdefault(record.season, []).append(f)
+    return buckets, unmarked
+
 def detect_season_from_folder_name(folder_name):
     """Detect season number from folder name"""
-    season_patterns = [
-        r'S(\d{1,2})',           # S01, S1, S12
-        r'Season\s*(\d{1,2})',   # Season 1, Season01
-        r'^(\d{1,2})$',          # 1, 01, 12 (exact match only)
-    ]
-    
-    for pattern in season_patterns:
-        match = re.search(pattern, folder_name, re.IGNORECASE)
-        if match:
-            season_num = int(match.group(1))
-            if 1 <= season_num <= 99:
-                return season_num
-    
-    return None
+    return classify_season_folder(folder_name)
 
 def parse_skip_seasons(skip_seasons_str):
     """Parse comma-separated list of season numbers to skip"""
@@ -327,7 +1052,100 @@ def parse_skip_seasons(skip_seasons_str):
         warning_echo("💡 Use comma-separated numbers (e.g., '1,3,5')")
         return set()
 
-def rename_season_folders(series_path, yes=False):
+def plan_folder_renames(series_path, season_mapping):
+    """Season folder renames for a scanned series, returns {old name: new name}.
+    
+    Planned from the same scan as the file renames, so the series isn't listed
+    again after its folders are renamed. Renames onto existing folders are left out.
+    """
+    rename_mapping = {}
+    for season_num, season_info in sorted(season_mapping.items()):
+        if season_info.get('flat'):
+            continue
+        folder_name = os.path.basename(season_info['path'])
+        new_name = f"Season {season_num}"
+        if folder_name == new_name or new_name in rename_mapping.values():
+            continue
+        if os.path.exists(os.path.join(series_path, new_name)):
+            continue
+        rename_mapping[folder_name] = new_name
+    return rename_mapping
+
+def renamed_season_path(season_path, renamed_paths):
+    """Where a season folder is after the folder renames (unchanged if its rename failed)"""
+    new_path = renamed_paths.get(season_path)
+    return new_path if new_path and os.path.isdir(new_path) else season_path
+
+def show_folder_renames(rename_mapping):
+    """Print proposed season folder renames"""
+    highlight_echo("\n📁 Proposed folder renames:")
+    click.echo(f"{Fore.CYAN}{'-' * 60}{Style.RESET_ALL}")
+    
+    for old_name, new_name in rename_mapping.items():
+        info_echo(f"📝  {old_name}")
+        success_echo(f"    -> {new_name}")
+        click.echo()
+    
+    click.echo(f"{Fore.CYAN}{'-' * 60}{Style.RESET_ALL}")
+
+def apply_folder_renames(series_path, rename_mapping, journal=None, lock_timeout=None):
+    """Rename season folders of a series, given as {old name: new name}"""
+    success_count = 0
+    error_count = 0
+    
+    try:
+        with folder_lock(series_path, lock_timeout):
+            scope = journal_scope(series_path, 'folders')
+            if journal:
+                journal.plan(scope, [(os.path.join(series_path, old), os.path.join(series_path, new))
+                                     for old, new in rename_mapping.items()])
+            
+            for old_name, new_name in rename_mapping.items():
+                old_path = os.path.join(series_path, old_name)
+                new_path = os.path.join(series_path, new_name)
+                
+                try:
+                    info_echo(f"📁 {old_name} -> {new_name}")
+                    os.rename(old_path, new_path)
+                    if journal:
+                        journal.done(old_path, new_path)
+                    success_count += 1
+                except OSError as e:
+                    error_echo(f"❌ Error renaming folder {old_name}: {e}")
+                    error_count += 1
+            
+            if journal:
+                journal.scope_done(scope)
+    except FolderLockedError as e:
+        error_echo(f"❌ {e}")
+        return False
+    
+    # Summary
+    click.echo()
+    if success_count > 0:
+        success_echo(f"✅ Successfully renamed: {success_count} folders")
+    if error_count > 0:
+        error_echo(f"❌ Errors: {error_count} folders")
+    
+    if error_count == 0 and success_count > 0:
+        success_echo("🎉 All season folders renamed successfully!")
+    elif error_count > 0:
+        warning_echo("💡 Some folders had issues. Check the errors above.")
+    
+    return True
+
+def settle_folder_renames(series_path, rename_mapping, yes=False, journal=None):
+    """Ask for and apply planned season folder renames, emptying rename_mapping"""
+    if not rename_mapping:
+        return
+    show_folder_renames(rename_mapping)
+    if yes or click.confirm("\nRename season folders?"):
+        apply_folder_renames(series_path, rename_mapping, journal)
+    else:
+        warning_echo("❌ Folder renaming cancelled.")
+    rename_mapping.clear()
+
+def rename_season_folders(series_path, yes=False, journal=None, lock_timeout=None):
     """Rename season folders to standard format (Season 1, Season 2, etc.)"""
     if not os.path.exists(series_path):
         error_echo(f"❌ Series path does not exist: {series_path}")
@@ -351,47 +1169,11 @@ def rename_season_folders(series_path, yes=False):
         info_echo("✅ All season folders already have standard names")
         return True
     
-    # Show proposed changes
-    highlight_echo("\n📁 Proposed folder renames:")
-    click.echo(f"{Fore.CYAN}{'-' * 60}{Style.RESET_ALL}")
-    
-    for old_name, new_name in rename_mapping.items():
-        info_echo(f"📝  {old_name}")
-        success_echo(f"    -> {new_name}")
-        click.echo()
-    
-    click.echo(f"{Fore.CYAN}{'-' * 60}{Style.RESET_ALL}")
+    show_folder_renames(rename_mapping)
     
     # Confirm and apply
     if yes or click.confirm("\nRename season folders?"):
-        success_count = 0
-        error_count = 0
-        
-        for old_name, new_name in rename_mapping.items():
-            old_path = os.path.join(series_path, old_name)
-            new_path = os.path.join(series_path, new_name)
-            
-            try:
-                info_echo(f"📁 {old_name} -> {new_name}")
-                os.rename(old_path, new_path)
-                success_count += 1
-            except OSError as e:
-                error_echo(f"❌ Error renaming folder {old_name}: {e}")
-                error_count += 1
-        
-        # Summary
-        click.echo()
-        if success_count > 0:
-            success_echo(f"✅ Successfully renamed: {success_count} folders")
-        if error_count > 0:
-            error_echo(f"❌ Errors: {error_count} folders")
-        
-        if error_count == 0 and success_count > 0:
-            success_echo("🎉 All season folders renamed successfully!")
-        elif error_count > 0:
-            warning_echo("💡 Some folders had issues. Check the errors above.")
-        
-        return True
+        return apply_folder_renames(series_path, rename_mapping, journal, lock_timeout)
     else:
         warning_echo("❌ Folder renaming cancelled.")
         return False
@@ -401,20 +1183,11 @@ def detect_season_from_files(files):
     if not files:
         return None
     
-    # Common patterns for season detection
-    season_patterns = [
-        r'S(\d{1,2})',           # S01, S1, S12
-        r'Season\s*(\d{1,2})',   # Season 1, Season01
-        r'(\d{1,2})x\d{1,2}',    # 1x01, 12x05
-        r'(\d{1,2})\.\d{1,2}',   # 1.01, 12.05
-        r'(\d{1,2})-\d{1,2}',    # 1-01, 12-05
-    ]
-    
     detected_seasons = []
     
     for filename in files:
-        for pattern in season_patterns:
-            match = re.search(pattern, filename, re.IGNORECASE)
+        for pattern in FILE_SEASON_PATTERNS:
+            match = pattern.search(filename)
             if match:
                 season_num = int(match.group(1))
                 if 1 <= season_num <= 99:  # Reasonable season range
@@ -437,26 +1210,12 @@ def detect_episode_format(files):
     if not files:
         return False
     
-    # Patterns that suggest double episodes
-    double_patterns = [
-        r'S\d{1,2}E(\d{1,2})E(\d{1,2})', # S03E01E02 (most specific first)
-        r'E(\d{1,2})E(\d{1,2})',     # E01E02
-        r'E(\d{1,2})-E(\d{1,2})',    # E01-E02
-        r'(\d{1,2})x(\d{1,2})',      # 1x01-02
-        r'(\d{1,2})-(\d{1,2})',      # 1-01-02
-        r'Ep(\d{1,2})-(\d{1,2})',    # Ep01-02
-        r'Episode(\d{1,2})-(\d{1,2})', # Episode01-02
-        r'ep(\d{1,2})-E(\d{1,2})',   # ep1-E02
-        r'(\d{1,2})-E(\d{1,2})',     # 1-E02
-        # Removed (\d{1,2})E(\d{1,2}) as it's too generic and matches S06E01
-    ]
-    
     double_count = 0
     total_files = len(files)
     
     for filename in files:
-        for pattern in double_patterns:
-            if re.search(pattern, filename, re.IGNORECASE):
+        for pattern in DOUBLE_EPISODE_PATTERNS:
+            if pattern.search(filename):
                 double_count += 1
                 break
     
@@ -495,28 +1254,165 @@ def clean_filename(title):
     
     return title
 
-def generate_mapping(files, titles, double=False):
-    mapping = {}
-    ep = 1
+class ParsedEpisode:
+    """Season and episode range parsed from one file name"""
+    __slots__ = ('name', 'season', 'first', 'last')
     
-    for f in files:
-        ext = os.path.splitext(f)[1]
-        
-        if double:
-            if ep + 1 <= len(titles):
-                # For double episodes, use both titles in one filename
-                # Format: Episode 01-02 - Title1 + Title2
-                title1 = clean_filename(titles[ep-1])
-                title2 = clean_filename(titles[ep])
-                new_name = f"Episode {ep:02d}-{ep+1:02d} - {title1} and {title2}{ext}"
-                ep += 2
+    def __init__(self, name, season, first, last):
+        self.name = name
+        self.season = season
+        self.first = first
+        self.last = last
+    
+    @property
+    def special(self):
+        return self.season == 0
+
+def parse_episode_file(name):
+    """Parse episode numbers from a file name, returns a ParsedEpisode or None"""
+    base = os.path.basename(name)
+    match = EPISODE_NUMBER_RE.search(base)
+    if not match:
+        if SPECIAL_EPISODE_RE.search(base):
+            return ParsedEpisode(name, 0, 0, 0)
+        return None
+    
+    season = match.group('season') or match.group('season_x')
+    first = int(match.group('first') or match.group('first_x') or match.group('first_e') or match.group('first_dash'))
+    tail = match.group('last') or match.group('last_x') or match.group('last_e') or match.group('last_dash') or ''
+    last = first
+    # "E01-03" is a range, "E09E10E11" a run of episodes
+    for number in re.findall(r'\d+', tail):
+        number = int(number)
+        if not last < number <= first + MAX_EPISODES_PER_FILE - 1:
+            # "E01-1080p" and the like are not episode ranges
+            break
+        last = number
+    
+    season = int(season) if season is not None else None
+    # Episode 0 is a special as well ("S01E00"), it has no title in the season's list
+    if season == 0 or first == 0 or SPECIAL_MARKER_RE.search(base[:match.start()]):
+        return ParsedEpisode(name, 0, first, last)
+    return ParsedEpisode(name, season, first, last)
+
+def use_episode_numbers(records, titles, double=False):
+    """Whether the parsed numbers can drive the mapping instead of sort order"""
+    regular = [record for record in records if record is None or not record.special]
+    if not regular:
+        # Only specials: numbered mapping leaves them all untouched
+        return bool(records)
+    if any(record is None for record in regular):
+        return False
+    
+    # Without a season marker, numbers past the season's titles or not starting near 1
+    # are absolute ("Show - 13.mkv" in season 2). With one, an episode the site doesn't
+    # list yet is just left without a title.
+    if all(record.season is None for record in regular):
+        if titles.get(max(record.last for record in regular) - 1) is None:
+            return False
+        if min(record.first for record in regular) > len(regular):
+            return False
+    
+    # Overlapping ranges (duplicates, different numbering schemes) can't be trusted
+    covered = set()
+    for record in regular:
+        episodes = set(range(record.first, record.last + 1))
+        if covered & episodes:
+            return False
+        covered |= episodes
+    
+    # Double episodes numbered per file (E01 = episodes 1-2) still go by position
+    if double and all(record.first == record.last for record in regular):
+        return False
+    return True
+
+class TitleBuffer:
+    """Random access to titles from an iterable, pulling only as far as needed"""
+    
+    def __init__(self, titles):
+        self._titles = []
+        self._source = iter(titles)
+    
+    def get(self, index):
+        if index < 0:
+            return None
+        while len(self._titles) <= index:
+            title = next(self._source, None)
+            if title is None:
+                return None
+            self._titles.append(title)
+        return self._titles[index]
+    
+    def __iter__(self):
+        index = 0
+        title = self.get(index)
+        while title is not None:
+            yield title
+            index += 1
+            title = self.get(index)
+
+def generate_numbered_mapping(records, titles):
+    """Map files to new names by their own episode numbers (gaps and specials don't shift anything)"""
+    mapping = {}
+    
+    for record in records:
+        if record.special:
+            info_echo(f"⏭️ Leaving special untouched: {record.name}")
+            continue
+        
+        ext = os.path.splitext(record.name)[1]
+        # Files in disc subfolders keep their folder
+        folder = os.path.dirname(record.name)
+        episode_titles = [titles.get(ep - 1) for ep in range(record.first, record.last + 1)]
+        
+        if None in episode_titles:
+            new_name = ""
+        elif record.last > record.first:
+            # Format: Episode 01-02 - Title1 and Title2
+            joined = " and ".join(clean_filename(title) for title in episode_titles)
+            new_name = os.path.join(folder, f"Episode {record.first:02d}-{record.last:02d} - {joined}{ext}")
+        else:
+            title = clean_filename(episode_titles[0])
+            new_name = os.path.join(folder, f"Episode {record.first:02d} - {title}{ext}")
+        mapping[record.name] = new_name
+    
+    return mapping
+
+def generate_mapping(files, titles, double=False):
+    """Map files to new names, pulling titles lazily from any iterable"""
+    records = [parse_episode_file(f) for f in files]
+    titles = TitleBuffer(titles)
+    if use_episode_numbers(records, titles, double):
+        return generate_numbered_mapping(records, titles)
+    
+    # Fall back to sort order when file names don't carry usable episode numbers
+    titles = iter(titles)
+    mapping = {}
+    ep = 1
+    
+    for f in files:
+        ext = os.path.splitext(f)[1]
+        # Files in disc subfolders keep their folder
+        folder = os.path.dirname(f)
+        
+        if double:
+            title1 = next(titles, None)
+            title2 = next(titles, None) if title1 is not None else None
+            if title2 is not None:
+                # For double episodes, use both titles in one filename
+                # Format: Episode 01-02 - Title1 + Title2
+                title1 = clean_filename(title1)
+                title2 = clean_filename(title2)
+                new_name = os.path.join(folder, f"Episode {ep:02d}-{ep+1:02d} - {title1} and {title2}{ext}")
+                ep += 2
             else:
                 new_name = ""
             mapping[f] = new_name
         else:
-            if ep <= len(titles):
-                title = clean_filename(titles[ep-1])
-                new_name = f"Episode {ep:02d} - {title}{ext}"
+            title = next(titles, None)
+            if title is not None:
+                title = clean_filename(title)
+                new_name = os.path.join(folder, f"Episode {ep:02d} - {title}{ext}")
                 ep += 1
             else:
                 new_name = ""
@@ -572,40 +1468,203 @@ def load_config(config_path):
     
     return mapping
 
-def apply_mapping(mapping, folder):
+class FolderLockedError(Exception):
+    """Raised when a folder stays locked by another run for longer than the lock timeout"""
+    
+    def __init__(self, folder, owner=None):
+        self.folder = folder
+        self.owner = owner
+        holder = f" by pid {owner.get('pid')} on {owner.get('host')}" if owner else ""
+        super().__init__(f"Folder is locked{holder}: {folder}")
+
+def _lock_owner_record():
+    return json.dumps({'pid': os.getpid(), 'host': socket.gethostname(), 'time': time.time()}).encode('utf-8')
+
+def _read_lock_owner(lock_path):
+    """Owner record of a lock file, or None"""
+    try:
+        with open(lock_path, "rb") as f:
+            return json.loads(f.read(4096) or b'null')
+    except (OSError, ValueError):
+        return None
+
+def _lock_is_stale(owner):
+    """Whether a lock file outlived its owner: a dead process on this host, or an old lock from another host"""
+    if not isinstance(owner, dict):
+        return False
+    if owner.get('host') == socket.gethostname():
+        try:
+            os.kill(owner.get('pid', 0), 0)
+        except ProcessLookupError:
+            return True
+        except (OSError, TypeError):
+            return False
+        return False
+    return time.time() - owner.get('time', time.time()) > LOCK_STALE_AFTER
+
+def _try_flock(lock_path):
+    """Take the flock on a lock file: fd when held, None when another process holds it,
+    False when the filesystem doesn't support flock"""
+    while True:
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        except OSError as e:
+            os.close(fd)
+            if e.errno in (errno.ENOLCK, errno.EOPNOTSUPP, errno.EINVAL):
+                return False
+            raise
+        except BaseException:
+            os.close(fd)
+            raise
+        
+        # The previous holder may have removed the file while we waited for it
+        try:
+            if os.stat(lock_path).st_ino == os.fstat(fd).st_ino:
+                return fd
+        except FileNotFoundError:
+            pass
+        os.close(fd)
+
+def _try_create_lock(lock_path):
+    """Create a lock file holding our owner record in one step; False if it exists"""
+    temp_path = f"{lock_path}.{socket.gethostname()}.{os.getpid()}"
+    with open(temp_path, "wb") as f:
+        f.write(_lock_owner_record())
+    try:
+        # link() never replaces an existing file, also on network shares
+        os.link(temp_path, lock_path)
+        return True
+    except FileExistsError:
+        return False
+    finally:
+        os.unlink(temp_path)
+
+def _break_stale_lock(lock_path, owner):
+    """Remove a lock file left by a dead run, unless another run took the lock meanwhile"""
+    stale_path = f"{lock_path}.{socket.gethostname()}.{os.getpid()}.stale"
+    try:
+        os.rename(lock_path, stale_path)
+    except FileNotFoundError:
+        return
+    if _read_lock_owner(stale_path) != owner:
+        try:
+            os.link(stale_path, lock_path)
+        except FileExistsError:
+            pass
+    os.unlink(stale_path)
+
+def lock_folder_for(folder):
+    """Folder whose lock covers renames in folder: the series for season and disc folders,
+    so season folder renames and file renames in those seasons exclude each other"""
+    folder = os.path.abspath(folder)
+    if DISC_FOLDER_RE.match(os.path.basename(folder)):
+        folder = os.path.dirname(folder)
+    if classify_season_folder(os.path.basename(folder)):
+        folder = os.path.dirname(folder)
+    return folder
+
+@contextmanager
+def folder_lock(folder, timeout=None):
+    """Hold an advisory lock on a folder while renaming in it.
+    
+    The lock is an flock on a lock file in the folder, so the kernel releases it
+    when the holder dies and a held flock is never broken. Where flock is not
+    available, the lock file itself is the lock: it is created atomically with
+    its owner record, and replaced once stale (see _lock_is_stale()).
+    Raises FolderLockedError after timeout seconds.
+    """
+    timeout = LOCK_TIMEOUT if timeout is None else timeout
+    lock_path = os.path.join(folder, LOCK_FILENAME)
+    deadline = time.monotonic() + timeout
+    use_flock = fcntl is not None
+    fd = None
+    while True:
+        if use_flock:
+            fd = _try_flock(lock_path)
+            if fd is False:
+                use_flock = False
+                continue
+            if fd is not None:
+                break
+        elif _try_create_lock(lock_path):
+            break
+        else:
+            owner = _read_lock_owner(lock_path)
+            if _lock_is_stale(owner):
+                warning_echo(f"⚠️ Removing stale lock of pid {owner.get('pid')} on {owner.get('host')}: {folder}")
+                _break_stale_lock(lock_path, owner)
+                continue
+        
+        if time.monotonic() >= deadline:
+            raise FolderLockedError(folder, _read_lock_owner(lock_path))
+        time.sleep(LOCK_POLL_INTERVAL)
+    
+    try:
+        if use_flock:
+            os.ftruncate(fd, 0)
+            os.write(fd, _lock_owner_record())
+        yield
+    finally:
+        # Remove the lock file before unlocking so waiters never lock a removed file for long
+        try:
+            os.unlink(lock_path)
+        except OSError:
+            pass
+        if use_flock:
+            os.close(fd)
+
+def apply_mapping(mapping, folder, journal=None, scope=None, lock_timeout=None):
     success_count = 0
     skip_count = 0
     error_count = 0
     
-    for old, new in mapping.items():
-        if not new:
-            warning_echo(f"⚠️ Skipped: {old} (no new name)")
-            skip_count += 1
-            continue
-        
-        old_path = os.path.join(folder, old)
-        new_path = os.path.join(folder, new)
-        
-        if not os.path.exists(old_path):
-            error_echo(f"❌ File not found: {old}")
-            error_count += 1
-            continue
+    # Only the renames hold the lock; planning them needs none
+    with folder_lock(lock_folder_for(folder), lock_timeout):
+        scope = scope or journal_scope(folder)
+        if journal:
+            journal.plan(scope, [(os.path.join(folder, old), os.path.join(folder, new))
+                                 for old, new in mapping.items() if new])
         
-        if os.path.exists(new_path):
-            error_echo(f"❌ File already exists: {new}")
-            error_count += 1
-            continue
+        for old, new in mapping.items():
+            if not new:
+                warning_echo(f"⚠️ Skipped: {old} (no new name)")
+                skip_count += 1
+                continue
+            
+            old_path = os.path.join(folder, old)
+            new_path = os.path.join(folder, new)
+            
+            if not os.path.exists(old_path):
+                error_echo(f"❌ File not found: {old}")
+                error_count += 1
+                continue
+            
+            if os.path.exists(new_path):
+                error_echo(f"❌ File already exists: {new}")
+                error_count += 1
+                continue
+            
+            try:
+                info_echo(f"📝 {old} -> {new}")
+                # Seasons split out of a flat folder go into new Season N folders
+                os.makedirs(os.path.dirname(new_path), exist_ok=True)
+                os.rename(old_path, new_path)
+                if journal:
+                    journal.done(old_path, new_path)
+                success_count += 1
+            except OSError as e:
+                error_echo(f"❌ Error renaming {old}: {e}")
+                error_count += 1
+            except Exception as e:
+                error_echo(f"❌ Unexpected error renaming {old}: {e}")
+                error_count += 1
         
-        try:
-            info_echo(f"📝 {old} -> {new}")
-            os.rename(old_path, new_path)
-            success_count += 1
-        except OSError as e:
-            error_echo(f"❌ Error renaming {old}: {e}")
-            error_count += 1
-        except Exception as e:
-            error_echo(f"❌ Unexpected error renaming {old}: {e}")
-            error_count += 1
+        if journal:
+            journal.scope_done(scope)
     
     # Summary with better formatting
     click.echo()
@@ -620,6 +1679,384 @@ def apply_mapping(mapping, folder):
         success_echo("🎉 All files processed successfully!")
     elif error_count > 0:
         warning_echo("💡 Some files had issues. Check the errors above.")
+    
+    return {'renamed': success_count, 'skipped': skip_count, 'errors': error_count}
+
+def reflink_file(src, dst):
+    """Copy-on-write clone of src to dst (Linux FICLONE), raises OSError if unsupported"""
+    if fcntl is None or not sys.platform.startswith('linux'):
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this platform")
+    with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+        try:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+        except OSError:
+            dst_file.close()
+            os.remove(dst)
+            raise
+
+def copy_file(src, dst):
+    """Full copy of src to dst, written under a temporary name first"""
+    partial = dst + '.part'
+    shutil.copy2(src, partial)
+    os.replace(partial, dst)
+
+def materialize_file(src, dst, link_mode='auto'):
+    """Create dst from src without renaming src, returns the method used"""
+    if link_mode == 'copy':
+        copy_file(src, dst)
+        return 'copied'
+    if link_mode == 'hardlink':
+        os.link(src, dst)
+        return 'linked'
+    if link_mode == 'reflink':
+        reflink_file(src, dst)
+        return 'reflinked'
+    
+    # auto: metadata-only operations on the same filesystem, copy only across devices
+    if os.stat(src).st_dev == os.stat(os.path.dirname(dst)).st_dev:
+        try:
+            os.link(src, dst)
+            return 'linked'
+        except OSError:
+            pass
+        try:
+            reflink_file(src, dst)
+            return 'reflinked'
+        except OSError:
+            pass
+    copy_file(src, dst)
+    return 'copied'
+
+def organize_season_dir(target_root, show, season):
+    """Library folder a season is organized into"""
+    return os.path.join(target_root, clean_filename(show), f"Season {season}")
+
+def organize_mapping(mapping, folder, target_root, show, season, link_mode='auto'):
+    """Place renamed copies of a season's files into target_root/Show/Season N, leaving the originals untouched"""
+    season_dir = organize_season_dir(target_root, show, season)
+    os.makedirs(season_dir, exist_ok=True)
+    
+    counts = {'linked': 0, 'reflinked': 0, 'copied': 0, 'skipped': 0, 'errors': 0}
+    
+    for old, new in mapping.items():
+        if not new:
+            warning_echo(f"⚠️ Skipped: {old} (no new name)")
+            counts['skipped'] += 1
+            continue
+        
+        src = os.path.join(folder, old)
+        # Disc subfolders are flattened in the library
+        dst = os.path.join(season_dir, os.path.basename(new))
+        
+        if not os.path.exists(src):
+            error_echo(f"❌ File not found: {old}")
+            counts['errors'] += 1
+            continue
+        
+        if os.path.exists(dst):
+            if os.path.samefile(src, dst):
+                counts['skipped'] += 1
+            else:
+                error_echo(f"❌ File already exists: {dst}")
+                counts['errors'] += 1
+            continue
+        
+        try:
+            method = materialize_file(src, dst, link_mode)
+            info_echo(f"🔗 {old} -> {dst} ({method})")
+            counts[method] += 1
+        except OSError as e:
+            error_echo(f"❌ Error organizing {old}: {e}")
+            counts['errors'] += 1
+    
+    click.echo()
+    placed = counts['linked'] + counts['reflinked'] + counts['copied']
+    if placed > 0:
+        success_echo(f"✅ Organized: {placed} files (linked: {counts['linked']}, "
+                     f"reflinked: {counts['reflinked']}, copied: {counts['copied']})")
+    if counts['skipped'] > 0:
+        warning_echo(f"⚠️ Skipped: {counts['skipped']} files")
+    if counts['errors'] > 0:
+        error_echo(f"❌ Errors: {counts['errors']} files")
+        warning_echo("💡 Some files had issues. Check the errors above.")
+    
+    return counts
+
+def apply_or_organize(mapping, folder, show, season, organize=None, link_mode='auto', journal=None, scope=None,
+                      lock_timeout=None):
+    """Rename in place, or organize into a library when a target is given"""
+    if organize:
+        return organize_mapping(mapping, folder, organize, show, season, link_mode)
+    return apply_mapping(mapping, folder, journal, scope, lock_timeout)
+
+def journal_scope(path, kind='files'):
+    """Journal key for a unit of work: file renames in a folder, season folder renames or a whole series"""
+    path = os.path.abspath(path)
+    return path if kind == 'files' else f"{kind}:{path}"
+
+def scope_lock_folder(scope):
+    """Folder to lock while replaying or undoing the renames of a journal scope"""
+    kind, sep, path = scope.partition(':')
+    if sep and os.path.isabs(path) and not os.path.isabs(scope):
+        # Season folder renames lock the series folder they are in
+        return path if kind == 'folders' else lock_folder_for(path)
+    return lock_folder_for(scope)
+
+def season_scope(folder, season, flat=False):
+    """Journal scope of one season's renames (seasons sharing a flat folder are tracked separately)"""
+    return journal_scope(folder, f"season-{season}") if flat else journal_scope(folder)
+
+def new_run_id():
+    """Unique, sortable id for a rename run"""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{os.urandom(2).hex()}"
+
+def read_journal(journal_path):
+    """Read journal entries, ignoring lines cut short by a crash"""
+    entries = []
+    # A line cut inside a multi-byte character must not stop the others from being read
+    with open(journal_path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+def find_journal(journal_dir, run_id, root=None):
+    """Path of a run's journal; run_id 'latest' picks the newest run (for root, if given)"""
+    if run_id != 'latest':
+        journal_path = os.path.join(journal_dir, f"{run_id}.jsonl")
+        return journal_path if os.path.exists(journal_path) else None
+    
+    if not os.path.isdir(journal_dir):
+        return None
+    for name in sorted(os.listdir(journal_dir), reverse=True):
+        if not name.endswith('.jsonl'):
+            continue
+        journal_path = os.path.join(journal_dir, name)
+        entries = read_journal(journal_path)
+        if entries and (root is None or entries[0].get('root') == os.path.abspath(root)):
+            return journal_path
+    return None
+
+class RenameJournal:
+    """Append-only write-ahead log of the renames of one run.
+    
+    Planned renames of a folder are synced to disk before any of them is
+    performed; completed renames are synced in batches. After a crash the
+    journal still tells which renames may have happened, which is all that
+    --resume and --undo need (the filesystem shows whether they did).
+    """
+    
+    def __init__(self, journal_path, run_id, readonly=False):
+        self.path = journal_path
+        self.run_id = run_id
+        self.completed_scopes = set()
+        # Previews of a resumed run read the journal without adding to it
+        self._file = None if readonly else open(journal_path, "a", encoding="utf-8")
+        self._unsynced = 0
+        if self._file and self._file.tell():
+            # Start on a fresh line if the last write was cut short
+            with open(journal_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+        self._renames = 0
+        self._planned = 0
+        self._fresh = False
+    
+    @classmethod
+    def create(cls, journal_dir, root):
+        """Start a new run"""
+        os.makedirs(journal_dir, exist_ok=True)
+        run_id = new_run_id()
+        journal = cls(os.path.join(journal_dir, f"{run_id}.jsonl"), run_id)
+        journal._fresh = True
+        journal._write({'op': 'run', 'run_id': run_id, 'root': os.path.abspath(root),
+                        'argv': sys.argv[1:], 'time': time.time()}, sync=True)
+        return journal
+    
+    @classmethod
+    def resume(cls, journal_dir, run_id, root, preview=False):
+        """Reopen a run, finish its interrupted renames and remember what was completed.
+        
+        With preview, only reports what resuming would do.
+        """
+        journal_path = find_journal(journal_dir, run_id, root)
+        if not journal_path:
+            return None
+        entries = read_journal(journal_path)
+        if not entries or entries[0].get('op') != 'run':
+            error_echo(f"❌ Journal has no run record: {journal_path}")
+            return None
+        journal = cls(journal_path, entries[0]['run_id'], readonly=preview)
+        if entries[0].get('root') != os.path.abspath(root):
+            warning_echo(f"⚠️ Run {journal.run_id} was started for {entries[0].get('root')}")
+        
+        done = {(e['src'], e['dst']) for e in entries if e['op'] == 'done'}
+        journal.completed_scopes = {e['scope'] for e in entries if e['op'] == 'scope_done'}
+        
+        # Planned renames that never completed are finished from the journal, since
+        # files renamed before the crash would no longer sort into the same plan
+        interrupted = {}
+        for entry in entries:
+            if entry['op'] == 'plan' and entry['scope'] not in journal.completed_scopes:
+                interrupted.setdefault(entry['scope'], []).append((entry['src'], entry['dst']))
+        for scope, pairs in interrupted.items():
+            if preview:
+                pending = [(src, dst) for src, dst in pairs
+                           if (src, dst) not in done and os.path.exists(src) and not os.path.exists(dst)]
+                info_echo(f"🔁 Interrupted renames to finish: {scope} ({len(pending)} left)")
+                continue
+            info_echo(f"🔁 Finishing interrupted renames: {scope}")
+            errors = 0
+            try:
+                with folder_lock(scope_lock_folder(scope)):
+                    for src, dst in pairs:
+                        if (src, dst) in done or not os.path.exists(src) or os.path.exists(dst):
+                            continue
+                        try:
+                            # Seasons split out of a flat folder go into new Season N folders
+                            os.makedirs(os.path.dirname(dst), exist_ok=True)
+                            os.rename(src, dst)
+                            journal.done(src, dst)
+                        except OSError as e:
+                            error_echo(f"❌ Error renaming {src}: {e}")
+                            errors += 1
+            except FolderLockedError as e:
+                error_echo(f"❌ {e}")
+                continue
+            # A scope with failed renames is planned again by the rescan
+            if not errors:
+                journal.scope_done(scope)
+        info_echo(f"📓 Resuming run {journal.run_id}: {len(journal.completed_scopes)} folders already done")
+        return journal
+    
+    def _write(self, entry, sync=False):
+        if self._file is None:
+            return
+        # ASCII only, so a line cut short by a crash never ends inside a character
+        self._file.write(json.dumps(entry) + "\n")
+        self._unsynced += 1
+        if sync or self._unsynced >= JOURNAL_SYNC_EVERY:
+            self.sync()
+    
+    def sync(self):
+        if self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+    
+    def is_done(self, scope):
+        """Whether a scope (see journal_scope()) was completed earlier in this run"""
+        return scope in self.completed_scopes
+    
+    def plan(self, scope, pairs):
+        """Record renames about to happen, durably"""
+        for src, dst in pairs:
+            self._planned += 1
+            self._write({'op': 'plan', 'scope': scope,
+                         'src': os.path.abspath(src), 'dst': os.path.abspath(dst)})
+        self.sync()
+    
+    def done(self, src, dst):
+        """Record a completed rename"""
+        self._renames += 1
+        self._write({'op': 'done', 'src': os.path.abspath(src), 'dst': os.path.abspath(dst)})
+    
+    def undone(self, src, dst):
+        """Record a reversed rename"""
+        self._write({'op': 'undone', 'src': src, 'dst': dst})
+    
+    def scope_done(self, scope):
+        """Record that every planned rename of a scope has been attempted"""
+        self.completed_scopes.add(scope)
+        self._write({'op': 'scope_done', 'scope': scope}, sync=True)
+    
+    def close(self):
+        if self._file is None or self._file.closed:
+            return
+        self._write({'op': 'end', 'time': time.time()}, sync=True)
+        self._file.close()
+        if self._fresh and not self._planned:
+            # Nothing was renamed, keep the journal folder clean
+            os.remove(self.path)
+        elif self._renames:
+            info_echo(f"📓 Journal: run {self.run_id} (undo with --undo {self.run_id})")
+
+def undo_run(journal_dir, run_id, yes=False, preview=False):
+    """Reverse every rename of a run, newest first"""
+    journal_path = find_journal(journal_dir, run_id)
+    if not journal_path:
+        error_echo(f"❌ No journal found for run: {run_id}")
+        return False
+    
+    entries = read_journal(journal_path)
+    if not entries or entries[0].get('op') != 'run':
+        error_echo(f"❌ Journal has no run record: {journal_path}")
+        return False
+    run_id = entries[0]['run_id']
+    # Every rename has a plan entry, in execution order; the filesystem tells which ones
+    # happened (including any done just before a crash, before its done entry was written)
+    planned = []
+    scopes = {}
+    for entry in entries:
+        pair = (entry.get('src'), entry.get('dst'))
+        if entry['op'] == 'plan' and pair not in scopes:
+            scopes[pair] = entry['scope']
+            planned.append(pair)
+    done = [(src, dst) for src, dst in reversed(planned) if os.path.exists(dst) and not os.path.exists(src)]
+    
+    if not done:
+        info_echo(f"✅ Nothing to undo for run {run_id}")
+        return True
+    
+    print_header(f"Undo run {run_id}")
+    for src, dst in done:
+        info_echo(f"↩️  {dst}")
+        success_echo(f"    -> {src}")
+    if preview or not (yes or click.confirm(f"\nUndo {len(done)} renames?")):
+        return False
+    
+    journal = RenameJournal(journal_path, run_id)
+    success_count = 0
+    error_count = 0
+    lock_folders = {scope_lock_folder(scopes[pair]) for pair in done}
+    with ExitStack() as locks:
+        try:
+            # Sorted, so two runs needing the same folders can't deadlock
+            for folder in sorted(lock_folders):
+                if os.path.isdir(folder):
+                    locks.enter_context(folder_lock(folder))
+        except FolderLockedError as e:
+            error_echo(f"❌ {e}")
+            journal.close()
+            return False
+        
+        for src, dst in done:
+            try:
+                os.rename(dst, src)
+                journal.undone(src, dst)
+                success_count += 1
+            except OSError as e:
+                error_echo(f"❌ Error restoring {src}: {e}")
+                error_count += 1
+        
+        # Season N folders made when splitting a flat folder go away once emptied
+        created = {os.path.dirname(dst) for src, dst in done if os.path.dirname(dst) != os.path.dirname(src)}
+        for folder in sorted(created):
+            try:
+                os.rmdir(folder)
+                info_echo(f"🗑️ Removed empty folder: {folder}")
+            except OSError:
+                pass
+    journal.close()
+    
+    click.echo()
+    success_echo(f"✅ Restored: {success_count}")
+    if error_count > 0:
+        error_echo(f"❌ Errors: {error_count}")
+    return error_count == 0
 
 def preview_changes(mapping):
     highlight_echo("\n📋 Proposed changes:")
@@ -635,6 +2072,684 @@ def preview_changes(mapping):
     
     click.echo(f"{Fore.CYAN}{'-' * 60}{Style.RESET_ALL}")
 
+def build_rename_plan(path, show, season=None, double=None, skip_seasons=None, skip_folders=None):
+    """Build rename mappings for every season found under path"""
+    all_files, season_mapping = get_all_episodes_from_series(path, skip_folders)
+    if not all_files:
+        raise LookupError(f"No video files found in {path}")
+    
+    if season_mapping:
+        if season and season not in season_mapping:
+            raise LookupError(f"Season {season} not found in {path}")
+        seasons = [season] if season else sorted(s for s in season_mapping if s not in (skip_seasons or ()))
+        units = [(s, season_mapping[s]['path'], season_mapping[s]['files'], season_mapping[s].get('flat', False))
+                 for s in seasons]
+    else:
+        season = season or detect_season_from_files(all_files)
+        if not season:
+            raise ValueError("Could not auto-detect season, specify it explicitly")
+        units = [(season, path, all_files, False)]
+    
+    resolved = resolve_show(show)
+    if not resolved and time_left() == 0:
+        raise TimeoutError("Run deadline reached while looking up the show")
+    if not resolved:
+        raise LookupError(f"Show not found: {show}")
+    
+    season_titles = prefetch_season_titles(show, [unit[0] for unit in units])
+    plans = []
+    for season_num, folder, files, flat in units:
+        use_double = double if double is not None else detect_episode_format(files)
+        titles = wait_within_deadline(season_titles[season_num])
+        if titles is None:
+            for future in season_titles.values():
+                future.cancel()
+            raise TimeoutError("Run deadline reached before all titles were fetched")
+        mapping = generate_mapping(files, titles, use_double)
+        if flat:
+            mapping = place_in_season_folder(mapping, season_num)
+        plans.append({
+            'season': season_num,
+            'folder': folder,
+            'flat': flat,
+            'double': use_double,
+            'mapping': mapping,
+            'missing': sum(1 for new in mapping.values() if not new),
+        })
+    
+    return {'show': show, 'provider': resolved[0], 'show_ref': resolved[1], 'plans': plans}
+
+def _int_param(params, name):
+    """Read an optional integer request parameter"""
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be an integer")
+
+def _bool_param(params, name):
+    """Read an optional boolean request parameter"""
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
+
+def _required_param(params, name):
+    """Read a required request parameter"""
+    value = params.get(name)
+    if not value:
+        raise ValueError(f"Missing parameter '{name}'")
+    return value
+
+def serve_resolve(params):
+    """Endpoint: resolve a show name to its IMDB URL"""
+    show = _required_param(params, 'show')
+    resolved = resolve_show(show)
+    if not resolved:
+        raise LookupError(f"Show not found: {show}")
+    return {'show': show, 'provider': resolved[0], 'show_ref': resolved[1]}
+
+def serve_seasons(params):
+    """Endpoint: season numbers of a show"""
+    show = _required_param(params, 'show')
+    seasons = get_metadata_router().list_seasons(show)
+    if not seasons:
+        raise LookupError(f"No seasons found for: {show}")
+    return {'show': show, 'seasons': seasons}
+
+def serve_titles(params):
+    """Endpoint: episode titles for one season"""
+    show = _required_param(params, 'show')
+    season = _int_param(params, 'season')
+    if season is None:
+        raise ValueError("Missing parameter 'season'")
+    titles = fetch_season_titles(show, season)
+    if not titles:
+        raise LookupError(f"No episodes found for season {season}")
+    return {'show': show, 'season': season, 'titles': titles}
+
+def serve_providers(params):
+    """Endpoint: observed latency and health of each metadata provider"""
+    return {'providers': get_metadata_router().report()}
+
+def serve_plan(params):
+    """Endpoint: rename plan for a series or season folder"""
+    path = _required_param(params, 'path')
+    if not os.path.isdir(path):
+        raise LookupError(f"Path does not exist: {path}")
+    return build_rename_plan(path, _required_param(params, 'show'),
+                             _int_param(params, 'season'), _bool_param(params, 'double'))
+
+def _is_relative_name(name):
+    """Whether a mapping entry is a non-empty path that can't leave its folder"""
+    if not isinstance(name, str) or not name or '\0' in name or os.path.isabs(name):
+        return False
+    parts = re.split(r'[\\/]', name)
+    return '..' not in parts and not os.path.splitdrive(name)[0]
+
+def serve_apply(params):
+    """Endpoint: apply a plan (as returned by /plan) or a single folder mapping"""
+    plans = params.get('plans')
+    if plans is None:
+        plans = [{'folder': _required_param(params, 'folder'), 'mapping': _required_param(params, 'mapping')}]
+    
+    if not isinstance(plans, list):
+        raise ValueError("'plans' must be a list")
+    for plan in plans:
+        if not isinstance(plan, dict) or not isinstance(plan.get('mapping'), dict) or not plan.get('folder'):
+            raise ValueError("Each plan needs 'folder' and a 'mapping' object")
+        # Renames stay inside the plan's folder
+        for old, new in plan['mapping'].items():
+            if not _is_relative_name(old) or not (new == '' or _is_relative_name(new)):
+                raise ValueError(f"Mapping entries must be relative paths inside the folder: {old!r} -> {new!r}")
+    
+    results = []
+    for plan in plans:
+        result = apply_mapping(plan['mapping'], plan['folder'])
+        result['folder'] = plan['folder']
+        results.append(result)
+    return {'results': results}
+
+# Endpoints that change files are only reachable with a JSON POST
+SERVE_POST_ONLY = {'/apply'}
+
+# Host names a TCP service answers to; other names in the Host header point to DNS rebinding
+SERVE_LOCAL_HOSTS = {'127.0.0.1', 'localhost', '::1'}
+
+def serve_allowed_hosts(host):
+    """Host header names accepted by a service listening on host"""
+    hosts = set(SERVE_LOCAL_HOSTS)
+    if host not in ('', '0.0.0.0', '::'):
+        hosts.add(host.lower())
+    return hosts
+
+def _host_header_name(value):
+    """Host name from a Host header, without the port ('[::1]:8765' -> '::1')"""
+    value = value.strip().lower()
+    if value.startswith('['):
+        return value[1:].split(']', 1)[0]
+    return value.rsplit(':', 1)[0] if value.count(':') == 1 else value
+
+SERVE_ROUTES = {
+    '/resolve': serve_resolve,
+    '/seasons': serve_seasons,
+    '/titles': serve_titles,
+    '/plan': serve_plan,
+    '/apply': serve_apply,
+    '/providers': serve_providers,
+}
+
+class EpisodicRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over the resolve/titles/plan/apply operations"""
+    server_version = "episodic/1.0.0"
+    
+    def do_GET(self):
+        if not self._check_host():
+            return
+        if urlparse(self.path).path in SERVE_POST_ONLY:
+            self._send_json(405, {'error': 'Use POST with a JSON body'})
+            return
+        query = parse_qs(urlparse(self.path).query)
+        self._dispatch({name: values[0] for name, values in query.items()})
+    
+    def do_POST(self):
+        if not self._check_host():
+            return
+        # Browsers can send text/plain across origins without asking, but not JSON
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            self._send_json(415, {'error': 'Content-Type must be application/json'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_json(400, {'error': 'Invalid Content-Length'})
+            return
+        try:
+            params = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json(400, {'error': 'Request body is not valid JSON'})
+            return
+        if not isinstance(params, dict):
+            self._send_json(400, {'error': 'Request body must be a JSON object'})
+            return
+        self._dispatch(params)
+    
+    def _check_host(self):
+        """Refuse requests for other host names, e.g. a page rebinding its own name to this service"""
+        allowed = self.server.allowed_hosts
+        if allowed is None or _host_header_name(self.headers.get('Host', '')) in allowed:
+            return True
+        self._send_json(403, {'error': 'Host not allowed'})
+        return False
+    
+    def _dispatch(self, params):
+        endpoint = SERVE_ROUTES.get(urlparse(self.path).path)
+        if endpoint is None:
+            self._send_json(404, {'error': f"Unknown endpoint, use one of: {', '.join(SERVE_ROUTES)}"})
+            return
+        
+        started = time.perf_counter()
+        try:
+            status, payload = 200, endpoint(params)
+        except ValueError as e:
+            status, payload = 400, {'error': str(e)}
+        except FolderLockedError as e:
+            status, payload = 409, {'error': str(e), 'owner': e.owner}
+        except LookupError as e:
+            status, payload = 404, {'error': str(e)}
+        except Exception as e:
+            status, payload = 500, {'error': f"Unexpected error: {e}"}
+        payload['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        self._send_json(status, payload)
+    
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            info_echo(f"🌐 {format % args}")
+
+class _WorkerPoolMixin:
+    """Handle each connection on a fixed-size thread pool instead of a thread per request"""
+    # Host header names to answer to, None for any (Unix sockets aren't reachable from browsers)
+    allowed_hosts = None
+    
+    def setup_pool(self, workers, verbose):
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.verbose = verbose
+    
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process_request_worker, request, client_address)
+    
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+    
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+class EpisodicHTTPServer(_WorkerPoolMixin, HTTPServer):
+    pass
+
+class EpisodicUnixHTTPServer(_WorkerPoolMixin, socketserver.UnixStreamServer):
+    pass
+
+def run_server(host, port, unix_socket=None, workers=8, verbose=False):
+    """Serve the JSON API until interrupted, keeping session and caches warm"""
+    if unix_socket:
+        if not hasattr(socket, 'AF_UNIX'):
+            error_echo("❌ Unix sockets are not supported on this platform")
+            return
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = EpisodicUnixHTTPServer(unix_socket, EpisodicRequestHandler)
+        address = unix_socket
+    else:
+        server = EpisodicHTTPServer((host, port), EpisodicRequestHandler)
+        server.allowed_hosts = serve_allowed_hosts(host)
+        address = f"http://{host}:{server.server_address[1]}"
+    server.setup_pool(workers, verbose)
+    
+    print_header("episodic service")
+    success_echo(f"🌐 Listening on {address} with {workers} workers")
+    info_echo(f"📡 Endpoints: {', '.join(SERVE_ROUTES)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        warning_echo("\n🛑 Shutting down")
+    finally:
+        server.server_close()
+        if unix_socket and os.path.exists(unix_socket):
+            os.remove(unix_socket)
+
+def fixture_key(url):
+    """Request key of a recorded page: path plus sorted query, independent of host"""
+    parsed = urlparse(url)
+    query = "&".join(sorted(parsed.query.split("&"))) if parsed.query else ""
+    return f"{parsed.path}?{query}" if query else parsed.path
+
+def fixture_filename(key):
+    """File name of a recorded page"""
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16] + ".html"
+
+def load_fixture_index(fixture_dir):
+    """Map of request key -> fixture file name for a fixture directory"""
+    index_path = os.path.join(fixture_dir, FIXTURE_INDEX_FILENAME)
+    if not os.path.exists(index_path):
+        return {}
+    with open(index_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def enable_fixture_recording(fixture_dir):
+    """Save every IMDB page fetched by the shared session into fixture_dir"""
+    os.makedirs(fixture_dir, exist_ok=True)
+    index = load_fixture_index(fixture_dir)
+    lock = threading.Lock()
+    
+    def record(response, *args, **kwargs):
+        if response.status_code != 200 or 'html' not in response.headers.get('Content-Type', 'text/html'):
+            return
+        # Key on the URL that was asked for, so redirects replay the same way
+        key = fixture_key((response.history[0] if response.history else response).request.url)
+        filename = fixture_filename(key)
+        with lock:
+            with open(os.path.join(fixture_dir, filename), "w", encoding="utf-8") as f:
+                f.write(response.text)
+            index[key] = filename
+            with open(os.path.join(fixture_dir, FIXTURE_INDEX_FILENAME), "w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False, indent=2, sort_keys=True)
+    
+    get_http_session().hooks['response'].append(record)
+    info_echo(f"📼 Recording IMDB pages to {fixture_dir}")
+
+class IMDBStandInHandler(BaseHTTPRequestHandler):
+    """Replays recorded IMDB pages with simulated latency, errors and throttling"""
+    server_version = "episodic-standin/1.0.0"
+    
+    def do_GET(self):
+        server = self.server
+        path = urlparse(self.path).path
+        if path == '/__stats':
+            with server.stats_lock:
+                self._send(200, json.dumps(server.stats).encode('utf-8'), 'application/json')
+            return
+        
+        delay = server.latency + random.uniform(-server.jitter, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        
+        roll = random.random()
+        if roll < server.throttle_rate:
+            self._count('throttled')
+            self._send(429, b'Too Many Requests', 'text/plain', {'Retry-After': str(server.retry_after)})
+            return
+        if roll < server.throttle_rate + server.error_rate:
+            self._count('errors')
+            self._send(503, b'Service Unavailable', 'text/plain')
+            return
+        
+        filename = server.index.get(fixture_key(self.path))
+        if not filename:
+            self._count('missing')
+            self._send(404, b'No recorded page for this request', 'text/plain')
+            return
+        
+        with open(os.path.join(server.fixture_dir, filename), "r", encoding="utf-8") as f:
+            # Absolute links must lead back to the stand-in, not to the real site
+            body = f.read().replace(IMDB_DEFAULT_URL, server.base_url)
+        self._count('served')
+        self._send(200, body.encode('utf-8'), 'text/html; charset=utf-8')
+    
+    def _count(self, outcome):
+        with self.server.stats_lock:
+            self.server.stats['requests'] += 1
+            self.server.stats[outcome] += 1
+    
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            info_echo(f"📼 {format % args}")
+
+def run_imdb_standin(fixture_dir, host, port, workers=8, latency_ms=0, jitter_ms=0,
+                     error_rate=0.0, throttle_rate=0.0, verbose=False):
+    """Serve recorded IMDB pages locally until interrupted"""
+    index = load_fixture_index(fixture_dir)
+    if not index:
+        error_echo(f"❌ No recorded pages in {fixture_dir} (record some with --record-fixtures)")
+        return
+    
+    server = EpisodicHTTPServer((host, port), IMDBStandInHandler)
+    server.setup_pool(workers, verbose)
+    server.fixture_dir = fixture_dir
+    server.index = index
+    server.base_url = f"http://{host}:{server.server_address[1]}"
+    server.latency = latency_ms / 1000
+    server.jitter = jitter_ms / 1000
+    server.error_rate = error_rate
+    server.throttle_rate = throttle_rate
+    server.retry_after = 1
+    server.stats = {'requests': 0, 'served': 0, 'missing': 0, 'errors': 0, 'throttled': 0}
+    server.stats_lock = threading.Lock()
+    
+    print_header("IMDB stand-in")
+    success_echo(f"📼 Replaying {len(index)} pages from {fixture_dir} on {server.base_url}")
+    info_echo(f"⏱️ Latency {latency_ms}±{jitter_ms} ms, errors {error_rate:.0%}, 429s {throttle_rate:.0%}")
+    info_echo(f"💡 Point episodic at it with: --imdb-url {server.base_url}  (stats: {server.base_url}/__stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        warning_echo("\n🛑 Shutting down")
+    finally:
+        server.server_close()
+
+def parse_shard(ctx, param, value):
+    """Parse --shard I/N into (index, count), I counting from 1"""
+    if not value:
+        return None
+    match = re.match(r'^\s*(\d+)\s*/\s*(\d+)\s*$', value)
+    if not match:
+        raise click.BadParameter("use the form I/N, e.g. 2/8")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise click.BadParameter("I must be between 1 and N")
+    return index, count
+
+def shard_of(series_key, count):
+    """Deterministic shard (1-based) of a series, identical on every node and Python run"""
+    digest = hashlib.sha1(series_key.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count + 1
+
+def get_series_folders(library_path):
+    """Get list of series folders in a library directory"""
+    if not os.path.isdir(library_path):
+        return []
+    return sorted(
+        item for item in os.listdir(library_path)
+        if not item.startswith('.') and os.path.isdir(os.path.join(library_path, item))
+    )
+
+def shard_report_filename(index, count):
+    """Report filename for one shard"""
+    return f"episodic-shard-{index}-of-{count}.json"
+
+def apply_series_plans(entry, series_path, organize=None, link_mode='auto', journal=None, lock_timeout=None):
+    """Apply the season plans of a library entry not applied yet, False if a folder is locked"""
+    applied = {result['season'] for result in entry['results']}
+    for season_plan in entry['plans']:
+        if season_plan['season'] in applied:
+            continue
+        scope = season_scope(season_plan['folder'], season_plan['season'], season_plan.get('flat'))
+        try:
+            result = apply_or_organize(season_plan['mapping'], season_plan['folder'], entry['series'],
+                                       season_plan['season'], organize, link_mode, journal, scope, lock_timeout)
+        except FolderLockedError as e:
+            entry['error'] = str(e)
+            return False
+        result['season'] = season_plan['season']
+        entry['results'].append(result)
+    
+    entry['status'] = 'organized' if organize else 'applied'
+    entry.pop('error', None)
+    if journal:
+        journal.scope_done(journal_scope(series_path, 'series'))
+    return True
+
+def process_library(library_path, shard=None, double=None, preview=False, yes=False,
+                    skip_seasons_set=None, report_dir=None, organize=None, link_mode='auto', journal=None):
+    """Rename every series folder in a library (or this node's shard of it)"""
+    index, count = shard or (1, 1)
+    series_folders = get_series_folders(library_path)
+    # Hash the path relative to the library so nodes with different mount points agree
+    selected = [name for name in series_folders if shard_of(name, count) == index]
+    
+    print_header(f"Library shard {index}/{count}" if shard else "Library")
+    info_echo(f"📚 {len(selected)} of {len(series_folders)} series folders in this shard")
+    
+    entries = []
+    deferred = []
+    for i, name in enumerate(selected, 1):
+        series_path = os.path.join(library_path, name)
+        highlight_echo(f"\n📺 [{i}/{len(selected)}] {name}")
+        if journal and journal.is_done(journal_scope(series_path, 'series')):
+            info_echo(f"⏭️ Already done in run {journal.run_id}")
+            continue
+        entry = {'series': name, 'show': name, 'status': 'planned', 'plans': [], 'results': []}
+        entries.append(entry)
+        if time_left() == 0:
+            warning_echo("⏰ Deferred: run deadline reached")
+            entry['status'] = 'deferred'
+            continue
+        
+        try:
+            plan = build_rename_plan(series_path, name, double=double, skip_seasons=skip_seasons_set,
+                                     skip_folders=journal.completed_scopes if journal else None)
+        except TimeoutError as e:
+            warning_echo(f"⏰ Deferring {name}: {e}")
+            entry['status'] = 'deferred'
+            continue
+        except (LookupError, ValueError) as e:
+            warning_echo(f"⚠️ Skipping {name}: {e}")
+            entry.update(status='error', error=str(e))
+            continue
+        if organize:
+            # Where the files end up, so merged reports can spot series organized into one folder
+            for season_plan in plan['plans']:
+                season_plan['target'] = organize_season_dir(os.path.abspath(organize), name, season_plan['season'])
+        entry.update(provider=plan['provider'], show_ref=plan['show_ref'], plans=plan['plans'])
+        
+        for season_plan in plan['plans']:
+            info_echo(f"   Season {season_plan['season']}: {len(season_plan['mapping'])} files, "
+                      f"{season_plan['missing']} without titles")
+        if preview:
+            entry['status'] = 'previewed'
+            continue
+        if not (yes or click.confirm(f"Rename files in {name}?")):
+            warning_echo(f"❌ Skipped {name}")
+            entry['status'] = 'skipped'
+            continue
+        
+        # Don't wait for folders another run is renaming, come back to them at the end
+        if not apply_series_plans(entry, series_path, organize, link_mode, journal, lock_timeout=0):
+            info_echo(f"🔒 {name} is locked by another run, retrying later")
+            deferred.append((entry, series_path))
+    
+    for entry, series_path in deferred:
+        highlight_echo(f"\n🔒 Retrying {entry['series']}")
+        if not apply_series_plans(entry, series_path, organize, link_mode, journal):
+            warning_echo(f"⚠️ Skipping {entry['series']}: {entry['error']}")
+            entry['status'] = 'locked'
+    
+    report = {
+        'library': os.path.abspath(library_path),
+        'shard': index,
+        'shards': count,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'series': entries,
+    }
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+        report_path = os.path.join(report_dir, shard_report_filename(index, count))
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        success_echo(f"💾 Shard report saved to: {report_path}")
+    
+    statuses = [entry['status'] for entry in entries]
+    click.echo()
+    info_echo(f"📊 Applied: {statuses.count('applied')}, organized: {statuses.count('organized')}, "
+              f"previewed: {statuses.count('previewed')}, "
+              f"skipped: {statuses.count('skipped')}, locked: {statuses.count('locked')}, "
+              f"deferred: {statuses.count('deferred')}, errors: {statuses.count('error')}")
+    return report
+
+def merge_shard_reports(report_dir):
+    """Combine shard reports from a directory and detect cross-shard conflicts"""
+    report_paths = sorted(
+        os.path.join(report_dir, name) for name in os.listdir(report_dir)
+        if re.match(r'^episodic-shard-\d+-of-\d+\.json$', name)
+    )
+    
+    reports = []
+    for report_path in report_paths:
+        with open(report_path, "r", encoding="utf-8") as f:
+            reports.append((report_path, json.load(f)))
+    
+    conflicts = []
+    counts = {report['shards'] for _, report in reports}
+    if len(counts) > 1:
+        conflicts.append(f"Reports were made with different shard counts: {sorted(counts)}")
+    libraries = {report['library'] for _, report in reports}
+    if len(libraries) > 1:
+        conflicts.append(f"Reports cover different library paths: {sorted(libraries)}")
+    
+    seen_shards = {}
+    for report_path, report in reports:
+        key = (report['shard'], report['shards'])
+        if key in seen_shards:
+            conflicts.append(f"Shard {key[0]}/{key[1]} reported twice: {seen_shards[key]}, {report_path}")
+        seen_shards[key] = report_path
+    for count in counts:
+        missing = sorted(set(range(1, count + 1)) - {shard for shard, c in seen_shards if c == count})
+        if missing:
+            conflicts.append(f"Missing reports for shards {', '.join(map(str, missing))} of {count}")
+    
+    series_owner = {}
+    targets = {}
+    folder_targets = {}
+    merged_series = []
+    for report_path, report in reports:
+        shard_label = f"{report['shard']}/{report['shards']}"
+        for entry in report['series']:
+            if entry['series'] in series_owner:
+                conflicts.append(f"Series '{entry['series']}' processed by shards "
+                                 f"{series_owner[entry['series']]} and {shard_label}")
+            series_owner[entry['series']] = shard_label
+            entry = dict(entry, shard=shard_label)
+            merged_series.append(entry)
+            
+            for season_plan in entry['plans']:
+                folder_target = season_plan.get('target')
+                if folder_target:
+                    # Names that clean to the same show ("A & B", "A and B") share a library folder
+                    if folder_target in folder_targets and folder_targets[folder_target][0] != entry['series']:
+                        conflicts.append(f"Library folder '{folder_target}' organized from series "
+                                         f"'{folder_targets[folder_target][0]}' (shard {folder_targets[folder_target][1]}) "
+                                         f"and '{entry['series']}' (shard {shard_label})")
+                    folder_targets[folder_target] = (entry['series'], shard_label)
+                for new in season_plan['mapping'].values():
+                    if not new:
+                        continue
+                    if folder_target:
+                        # Organized copies land in the library, disc subfolders flattened
+                        target = os.path.join(folder_target, os.path.basename(new))
+                    else:
+                        target = os.path.join(season_plan['folder'], new)
+                    if target in targets and targets[target][0] != entry['series']:
+                        conflicts.append(f"Target '{target}' planned for series '{targets[target][0]}' "
+                                         f"(shard {targets[target][1]}) and '{entry['series']}' (shard {shard_label})")
+                    targets[target] = (entry['series'], shard_label)
+    
+    statuses = [entry['status'] for entry in merged_series]
+    return {
+        'libraries': sorted(libraries),
+        'reports': [report_path for report_path, _ in reports],
+        'totals': {status: statuses.count(status) for status in sorted(set(statuses))},
+        'conflicts': conflicts,
+        'series': sorted(merged_series, key=lambda entry: entry['series']),
+    }
+
+def merge_reports_command(report_dir):
+    """Merge shard reports in report_dir and print a summary"""
+    if not os.path.isdir(report_dir):
+        error_echo(f"❌ Report directory does not exist: {report_dir}")
+        return False
+    
+    merged = merge_shard_reports(report_dir)
+    if not merged['reports']:
+        error_echo(f"❌ No shard reports found in {report_dir}")
+        return False
+    
+    merged_path = os.path.join(report_dir, MERGED_REPORT_FILENAME)
+    with open(merged_path, "w", encoding="utf-8") as f:
+        json.dump(merged, f, ensure_ascii=False, indent=2)
+    
+    print_header("Merged Shard Reports")
+    info_echo(f"📄 Reports: {len(merged['reports'])}, series: {len(merged['series'])}")
+    for status, total in merged['totals'].items():
+        info_echo(f"   {status}: {total}")
+    if merged['conflicts']:
+        error_echo(f"❌ {len(merged['conflicts'])} conflicts:")
+        for conflict in merged['conflicts']:
+            warning_echo(f"   {conflict}")
+    else:
+        success_echo("✅ No cross-shard conflicts")
+    success_echo(f"💾 Merged report saved to: {merged_path}")
+    return not merged['conflicts']
+
 @click.command(
     name='episodic',
     context_settings=dict(help_option_names=['-h', '--help']),
@@ -653,12 +2768,47 @@ def preview_changes(mapping):
 @click.option('--yes', is_flag=True, help='Automatically confirm all rename operations without prompting')
 @click.option('--rename-folders', is_flag=True, help='Rename season folders to standard format (Season 1, Season 2, etc.)')
 @click.option('--skip-seasons', help='Comma-separated list of season numbers to skip (e.g., "1,3,5")')
+@click.option('--serve', is_flag=True, help='Run a local HTTP service exposing resolve/titles/plan/apply')
+@click.option('--host', default='127.0.0.1', help='Address for --serve (default: 127.0.0.1)')
+@click.option('--port', type=int, default=SERVE_DEFAULT_PORT, help=f'Port for --serve (default: {SERVE_DEFAULT_PORT})')
+@click.option('--socket', 'unix_socket', help='Serve on a Unix socket instead of TCP')
+@click.option('--workers', type=int, default=8, help='Worker threads for --serve (default: 8)')
+@click.option('--providers', help='Comma-separated metadata providers in order of preference: imdb, stub (default: imdb)')
+@click.option('--stub-file', type=click.Path(exists=True, dir_okay=False), help='JSON file for the offline stub provider')
+@click.option('--library', is_flag=True, help='Treat path as a library: every subfolder is a series named after the folder')
+@click.option('--shard', callback=parse_shard, help='With --library, process only shard I of N (e.g. "2/8")')
+@click.option('--report-dir', help='With --library, save a JSON report of plans and results to this folder')
+@click.option('--merge-reports', help='Merge shard reports in this folder and check for conflicts')
+@click.option('--organize', 'organize', metavar='LIBRARY', help='Place renamed links/copies into LIBRARY/Show/Season N instead of renaming in place')
+@click.option('--link-mode', type=click.Choice(['auto', 'hardlink', 'reflink', 'copy']), default='auto',
+              help='How --organize creates files (default: auto = hardlink/reflink, copy across devices)')
+@click.option('--resume', is_flag=False, flag_value='latest', default=None, metavar='[RUN_ID]',
+              help='Continue an interrupted run (default: the latest run for this path)')
+@click.option('--undo', metavar='RUN_ID', help='Reverse all renames of a run ("latest" for the newest run)')
+@click.option('--journal-dir', default=JOURNAL_DIR, help='Where rename journals are kept (default: ~/.episodic/journal)')
+@click.option('--lock-timeout', type=click.FloatRange(min=0), default=LOCK_TIMEOUT,
+              help=f'Seconds to wait for a folder that another run is renaming (default: {LOCK_TIMEOUT})')
+@click.option('--imdb-url', envvar='EPISODIC_IMDB_URL', help='Base URL for IMDB requests, e.g. a local stand-in (env: EPISODIC_IMDB_URL)')
+@click.option('--parse-processes', is_flag=True, help='Parse downloaded IMDB pages in a process pool, one process per CPU')
+@click.option('--hedge-after', type=click.FloatRange(1, 100), metavar='PERCENTILE',
+              help='Send a duplicate IMDB request when one is slower than this percentile of recent requests (e.g. 95)')
+@click.option('--deadline', type=click.FloatRange(min=0), metavar='SECONDS',
+              help='Stop waiting for titles after SECONDS; remaining seasons/series are deferred to another run')
+@click.option('--record-fixtures', metavar='DIR', help='Save every fetched IMDB page to DIR for the stand-in')
+@click.option('--imdb-standin', metavar='DIR', help='Serve pages recorded in DIR as a local IMDB stand-in')
+@click.option('--latency-ms', type=int, default=0, help='Stand-in: delay per request in ms')
+@click.option('--jitter-ms', type=int, default=0, help='Stand-in: random +/- variation of the delay in ms')
+@click.option('--error-rate', type=click.FloatRange(0, 1), default=0.0, help='Stand-in: fraction of requests answered with 503')
+@click.option('--throttle-rate', type=click.FloatRange(0, 1), default=0.0, help='Stand-in: fraction of requests answered with 429')
 @click.version_option(version='1.0.0')
-def main(path, show, season, double, config, preview, save_config, config_file, all_seasons, verbose, yes, rename_folders, skip_seasons):
+def main(path, show, season, double, config, preview, save_config, config_file, all_seasons, verbose, yes, rename_folders, skip_seasons,
+         serve, host, port, unix_socket, workers, providers, stub_file, library, shard, report_dir, merge_reports,
+         organize, link_mode, resume, undo, journal_dir, lock_timeout, imdb_url, parse_processes, hedge_after,
+         deadline, record_fixtures, imdb_standin, latency_ms, jitter_ms, error_rate, throttle_rate):
     """episodic - TV Series File Renamer
-
+    
     Automatically rename TV series files using episode titles from IMDB.
-
+    
     Examples:
         episodic -s "Breaking Bad" -n 1                    # Use current directory
         episodic -p /path/to/episodes -s "Breaking Bad" -n 1
@@ -674,18 +2824,93 @@ def main(path, show, season, double, config, preview, save_config, config_file,
         episodic -p /path/to/episodes -c rename_config.txt
         episodic -s "Breaking Bad" --save-config           # Save config only
         episodic -p /path/to/episodes -s "Breaking Bad" --save-config
+        episodic --serve                                    # Local HTTP service
+        episodic -p /media/tv --library --shard 1/4 --yes   # One node's share of a library
+        episodic --merge-reports reports/                   # Combine shard reports
+        episodic -p ~/Downloads/Show -s "Show" --all-seasons --organize /media/tv
+        episodic -p /path/to/series -s "Breaking Bad" --all-seasons --resume
+        episodic --undo 20250101-120000-ab12               # Reverse a run
+        episodic --imdb-standin fixtures/ --latency-ms 200 --throttle-rate 0.05
     """
     
+    if imdb_standin:
+        run_imdb_standin(imdb_standin, host, port, workers, latency_ms, jitter_ms,
+                         error_rate, throttle_rate, verbose)
+        return
+    
+    if imdb_url:
+        set_imdb_base_url(imdb_url)
+    if record_fixtures:
+        enable_fixture_recording(record_fixtures)
+    set_lock_timeout(lock_timeout)
+    
+    if providers is None:
+        # A stub file on its own means: prefer it, fall back to IMDB
+        providers = 'stub,imdb' if stub_file else 'imdb'
+    router = configure_providers(providers, stub_file)
+    if parse_processes:
+        parse_workers = configure_parse_pool()
+        if verbose:
+            info_echo(f"🧮 Parsing pages in {parse_workers} processes")
+    if hedge_after:
+        configure_hedging(hedge_after)
+    
+    if serve:
+        run_server(host, port, unix_socket, workers, verbose)
+        return
+    set_run_deadline(deadline)
+    
+    if merge_reports:
+        if not merge_reports_command(merge_reports):
+            sys.exit(1)
+        return
+    
+    if undo:
+        if not undo_run(journal_dir, undo, yes, preview):
+            sys.exit(1)
+        return
+    
+    if shard and not library:
+        error_echo("❌ --shard needs --library")
+        return
+    
+    # Every rename is journaled so an interrupted run can be resumed or undone
+    journal = None
+    if resume:
+        journal = RenameJournal.resume(journal_dir, resume, path, preview)
+        if not journal:
+            error_echo(f"❌ No journal found to resume: {resume}")
+            return
+    elif not preview and not save_config:
+        journal = RenameJournal.create(journal_dir, path)
+    if journal:
+        click.get_current_context().call_on_close(journal.close)
+    
+    if library:
+        skip_seasons_set = parse_skip_seasons(skip_seasons)
+        if shard and not report_dir:
+            report_dir = '.'
+        process_library(path, shard, double, preview, yes, skip_seasons_set, report_dir, organize, link_mode, journal)
+        return
+    
+    # Season folders finished earlier in a resumed run are not scanned again
+    skip_folders = journal.completed_scopes if journal else None
+    
     # Check if this is a series folder with multiple seasons
-    all_files, season_mapping = get_all_episodes_from_series(path)
+    all_files, season_mapping = get_all_episodes_from_series(path, skip_folders)
     
     # Handle folder renaming if requested
-    if rename_folders:
+    folder_renames = {}
+    if rename_folders and show and not config and season_mapping:
+        # Renamed together with the files, in one plan from the scan above
+        folder_renames = plan_folder_renames(path, season_mapping)
+    elif rename_folders:
         print_header("Renaming Season Folders")
-        if not rename_season_folders(path, yes):
+        if not rename_season_folders(path, yes, journal):
             return
-        # Refresh season mapping after folder renaming
-        all_files, season_mapping = get_all_episodes_from_series(path)
+        if not show and not config:
+            return
+    renamed_paths = {os.path.join(path, old): os.path.join(path, new) for old, new in folder_renames.items()}
     
     if not all_files:
         click.echo("❌ No video files found in specified folder")
@@ -693,239 +2918,318 @@ def main(path, show, season, double, config, preview, save_config, config_file,
     
     if season_mapping:
         # Multiple seasons found
-        highlight_echo(f"📺 Found {len(season_mapping)} season folders:")
+        if any(info.get('flat') for info in season_mapping.values()):
+            highlight_echo(f"📺 Found {len(season_mapping)} seasons (split by the season in file names):")
+        else:
+            highlight_echo(f"📺 Found {len(season_mapping)} season folders:")
         for season_num in sorted(season_mapping.keys()):
             season_info = season_mapping[season_num]
             info_echo(f"   Season {season_num}: {len(season_info['files'])} episodes")
         info_echo(f"📁 Total: {len(all_files)} episodes")
+        if folder_renames:
+            show_folder_renames(folder_renames)
     else:
         # Single season or flat structure
         files = all_files  # Use files already found by get_all_episodes_from_series
         info_echo(f"📁 Found {len(files)} video files in single folder")
-
-    if config:
-        mapping = load_config(config)
-        if not mapping:
-            return
+    
+    try:
+        if config:
+            if organize:
+                error_echo("❌ --organize needs --show and a season, not --config")
+                return
         
-        if save_config:
-            # Save configuration to file
-            dump_config(mapping, path, config_file)
-            return
+            mapping = load_config(config)
+            if not mapping:
+                return
         
-        preview_changes(mapping)
+            if save_config:
+                # Save configuration to file
+                dump_config(mapping, path, config_file)
+                return
         
-        if not preview:
-            if yes or click.confirm("\nRename files?"):
-                apply_mapping(mapping, path)
-            else:
-                warning_echo("❌ Cancelled.")
-    else:
-        if not show and not rename_folders:
-            error_echo("❌ Need to specify --show, or --config, or --rename-folders")
-            return
+            preview_changes(mapping)
         
-        # If only rename_folders is specified, exit after folder renaming
-        if rename_folders and not show:
-            return
+            if not preview:
+                if yes or click.confirm("\nRename files?"):
+                    try:
+                        apply_mapping(mapping, path, journal)
+                    except FolderLockedError as e:
+                        error_echo(f"❌ {e}")
+                else:
+                    warning_echo("❌ Cancelled.")
+        else:
+            if not show and not rename_folders:
+                error_echo("❌ Need to specify --show, or --config, or --rename-folders")
+                return
         
-        if all_seasons and season_mapping:
-            # Process all seasons
-            print_header("Processing All Seasons")
+            if all_seasons and season_mapping:
+                # Process all seasons
+                print_header("Processing All Seasons")
             
-            # Parse skip seasons
-            skip_seasons_set = parse_skip_seasons(skip_seasons)
-            if skip_seasons_set:
-                info_echo(f"⏭️ Will skip seasons: {', '.join(map(str, sorted(skip_seasons_set)))}")
+                # Parse skip seasons
+                skip_seasons_set = parse_skip_seasons(skip_seasons)
+                if skip_seasons_set:
+                    info_echo(f"⏭️ Will skip seasons: {', '.join(map(str, sorted(skip_seasons_set)))}")
             
-            # Find show URL once for all seasons
-            show_url = find_show_on_imdb(show)
-            if not show_url:
-                error_echo("❌ Failed to find show on IMDB. Exiting.")
-                return
+                # Resolve the show once for all seasons
+                if not router.resolve_show(show):
+                    if time_left() == 0:
+                        warning_echo("\n⏰ Deadline reached while looking up the show, all seasons deferred")
+                        info_echo("🔁 Run again to continue (--resume skips the seasons already done)")
+                        return
+                    error_echo("❌ Failed to find show with any metadata provider. Exiting.")
+                    return
             
-            total_renamed = 0
-            total_skipped = 0
-            total_seasons = len(season_mapping)
+                total_renamed = 0
+                total_skipped = 0
+                total_seasons = len(season_mapping)
             
-            # Filter out seasons to skip
-            seasons_to_process = [s for s in sorted(season_mapping.keys()) if s not in skip_seasons_set]
-            if skip_seasons_set:
-                skipped_count = total_seasons - len(seasons_to_process)
-                info_echo(f"📊 Processing {len(seasons_to_process)} seasons (skipping {skipped_count})")
-            else:
-                info_echo(f"🚀 Processing {total_seasons} seasons automatically...")
+                # Filter out seasons to skip
+                seasons_to_process = [s for s in sorted(season_mapping.keys()) if s not in skip_seasons_set]
+                if skip_seasons_set:
+                    skipped_count = total_seasons - len(seasons_to_process)
+                    info_echo(f"📊 Processing {len(seasons_to_process)} seasons (skipping {skipped_count})")
+                else:
+                    info_echo(f"🚀 Processing {total_seasons} seasons automatically...")
             
-            for i, season_num in enumerate(seasons_to_process, 1):
-                season_info = season_mapping[season_num]
-                season_path = season_info['path']
-                season_files = season_info['files']
+                # Every season needs its titles, so fetch them all at once
+                season_titles = prefetch_season_titles(show, seasons_to_process)
+            
+                deferred = []
+                for i, season_num in enumerate(seasons_to_process, 1):
+                    season_info = season_mapping[season_num]
+                    season_path = season_info['path']
+                    season_files = season_info['files']
                 
-                # Clear screen for interactive experience
-                if not verbose:
-                    clear_screen()
-                    print_header(f"Processing Season {season_num}")
-                    print_progress(i, total_seasons, "Seasons")
+                    # Past the run deadline, leave the remaining seasons for another run
+                    titles = wait_within_deadline(season_titles[season_num])
+                    if titles is None:
+                        deferred = seasons_to_process[i - 1:]
+                        for future in season_titles.values():
+                            future.cancel()
+                        break
                 
-                info_echo(f"\n📺 Processing Season {season_num}...")
+                    # Clear screen for interactive experience
+                    if not verbose:
+                        clear_screen()
+                        print_header(f"Processing Season {season_num}")
+                        print_progress(i, total_seasons, "Seasons")
                 
-                # Auto-detect episode format for this season
-                season_double = detect_episode_format(season_files)
-                if season_double:
-                    highlight_echo(f"🎬 Detected double episodes format for Season {season_num}")
-                else:
-                    highlight_echo(f"🎬 Detected single episodes format for Season {season_num}")
+                    info_echo(f"\n📺 Processing Season {season_num}...")
                 
-                titles = get_episode_titles(show_url, season_num)
-                if not titles:
-                    warning_echo(f"⚠️ Skipping season {season_num} - no titles found")
-                    continue
+                    # Auto-detect episode format for this season
+                    season_double = detect_episode_format(season_files)
+                    if season_double:
+                        highlight_echo(f"🎬 Detected double episodes format for Season {season_num}")
+                    else:
+                        highlight_echo(f"🎬 Detected single episodes format for Season {season_num}")
                 
-                # Use season-specific format detection, but allow manual override
-                use_double = double if double is not None else season_double
-                mapping = generate_mapping(season_files, titles, use_double)
+                    # Use season-specific format detection, but allow manual override
+                    use_double = double if double is not None else season_double
+                    mapping = generate_mapping(season_files, titles, use_double)
+                    if season_info.get('flat'):
+                        mapping = place_in_season_folder(mapping, season_num)
+                    if not any(mapping.values()):
+                        warning_echo(f"⚠️ Skipping season {season_num} - no titles found")
+                        continue
                 
-                if save_config:
-                    # Use config_file for filename
-                    config_filename = f"season_{season_num}_{config_file}"
-                    dump_config(mapping, season_path, config_filename)
+                    if save_config:
+                        # Folders first, so the printed command points at the season's final folder
+                        settle_folder_renames(path, folder_renames, yes, journal)
+                        season_path = renamed_season_path(season_path, renamed_paths)
+                        # Use config_file for filename
+                        config_filename = f"season_{season_num}_{config_file}"
+                        dump_config(mapping, season_path, config_filename)
                     
-                    if verbose:
-                        success_echo(f"💾 Configuration saved for Season {season_num}")
-                    continue
+                        if verbose:
+                            success_echo(f"💾 Configuration saved for Season {season_num}")
+                        continue
                 
-                if preview:
-                    if verbose:
-                        preview_changes(mapping)
-                else:
-                    if yes or click.confirm(f"Rename files in Season {season_num}?"):
-                        apply_mapping(mapping, season_path)
-                        total_renamed += sum(1 for new in mapping.values() if new)
-                        total_skipped += sum(1 for new in mapping.values() if not new)
+                    if preview:
+                        if verbose:
+                            preview_changes(mapping)
                     else:
-                        warning_echo(f"❌ Skipped Season {season_num}")
+                        if yes or click.confirm(f"{'Organize' if organize else 'Rename'} files in Season {season_num}?"):
+                            # Folders go first, the file renames are planned against their new names
+                            if folder_renames:
+                                renamed = apply_folder_renames(path, folder_renames, journal)
+                                folder_renames.clear()
+                                if not renamed:
+                                    return
+                            season_path = renamed_season_path(season_path, renamed_paths)
+                            scope = season_scope(season_path, season_num, season_info.get('flat'))
+                            try:
+                                apply_or_organize(mapping, season_path, show, season_num, organize, link_mode, journal, scope)
+                            except FolderLockedError as e:
+                                error_echo(f"❌ {e}")
+                                continue
+                            total_renamed += sum(1 for new in mapping.values() if new)
+                            total_skipped += sum(1 for new in mapping.values() if not new)
+                        else:
+                            warning_echo(f"❌ Skipped Season {season_num}")
                 
-                # Small delay for better UX
-                if not verbose:
-                    time.sleep(0.5)
+                    # Small delay for better UX
+                    if not verbose:
+                        time.sleep(0.5)
             
-            if not preview and not save_config:
-                success_echo(f"\n🎉 All seasons processed!")
-                info_echo(f"📊 Total renamed: {total_renamed}, skipped: {total_skipped}")
+                if not preview and not save_config and not deferred:
+                    success_echo(f"\n🎉 All seasons processed!")
+                    info_echo(f"📊 Total renamed: {total_renamed}, skipped: {total_skipped}")
             
-            # Final cleanup - clear screen and show summary
-            if not verbose:
-                clear_screen()
-                print_header("Processing Complete")
-                success_echo(f"🎉 All {total_seasons} seasons processed successfully!")
-                info_echo(f"📊 Total renamed: {total_renamed}, skipped: {total_skipped}")
-                if save_config:
-                    success_echo("💾 All configurations saved to respective season folders")
-            return
+                # Final cleanup - clear screen and show summary
+                if not verbose:
+                    clear_screen()
+                    print_header("Processing Complete")
+                    if not deferred:
+                        success_echo(f"🎉 All {total_seasons} seasons processed successfully!")
+                    info_echo(f"📊 Total renamed: {total_renamed}, skipped: {total_skipped}")
+                    if save_config:
+                        success_echo("💾 All configurations saved to respective season folders")
+                if deferred:
+                    warning_echo(f"\n⏰ Deadline reached, deferred seasons: {', '.join(map(str, deferred))}")
+                    info_echo("🔁 Run again to continue (--resume skips the seasons already done)")
+                return
         
-        # Single season processing
-        if not season:
-            if season_mapping:
-                # Multiple seasons found, but no specific season specified
-                info_echo("🔍 Multiple seasons found. Please specify season with -n or use --all-seasons")
+            # Single season processing
+            season_path = path
+            season_flat = False
+            if not season:
+                if season_mapping:
+                    # Multiple seasons found, but no specific season specified
+                    info_echo("🔍 Multiple seasons found. Please specify season with -n or use --all-seasons")
                 
-                # Parse skip seasons for display
-                skip_seasons_set = parse_skip_seasons(skip_seasons)
+                    # Parse skip seasons for display
+                    skip_seasons_set = parse_skip_seasons(skip_seasons)
                 
-                info_echo("Available seasons:")
-                for season_num in sorted(season_mapping.keys()):
-                    if season_num in skip_seasons_set:
-                        warning_echo(f"   -n {season_num} (will be skipped)")
+                    info_echo("Available seasons:")
+                    for season_num in sorted(season_mapping.keys()):
+                        if season_num in skip_seasons_set:
+                            warning_echo(f"   -n {season_num} (will be skipped)")
+                        else:
+                            highlight_echo(f"   -n {season_num}")
+                    return
+                else:
+                    # Single season, auto-detect from file names
+                    info_echo("🔍 Auto-detecting season number from file names...")
+                    season = detect_season_from_files(files)
+                    if season:
+                        success_echo(f"✅ Detected season {season}")
+                        # Auto-detect episode format for single season
+                        season_double = detect_episode_format(files)
+                        if season_double:
+                            highlight_echo(f"🎬 Detected double episodes format for Season {season}")
+                        else:
+                            highlight_echo(f"🎬 Detected single episodes format for Season {season}")
+                        # Use season-specific format detection, but allow manual override
+                        use_double = double if double is not None else season_double
                     else:
-                        highlight_echo(f"   -n {season_num}")
-                return
+                        error_echo("❌ Could not auto-detect season. Please specify with -n")
+                        return
             else:
-                # Single season, auto-detect from file names
-                info_echo("🔍 Auto-detecting season number from file names...")
-                season = detect_season_from_files(files)
-                if season:
-                    success_echo(f"✅ Detected season {season}")
-                    # Auto-detect episode format for single season
+                # Check if specified season should be skipped
+                skip_seasons_set = parse_skip_seasons(skip_seasons)
+                if season in skip_seasons_set:
+                    warning_echo(f"⏭️ Season {season} is in skip list, exiting.")
+                    return
+            
+                highlight_echo(f"📺 Using specified season: {season}")
+            
+                # If we have season mapping, get files from specific season
+                if season_mapping and season in season_mapping:
+                    season_info = season_mapping[season]
+                    files = season_info['files']
+                    season_path = season_info['path']
+                    season_flat = season_info.get('flat', False)
+                    if season_flat:
+                        info_echo(f"📁 Using Season {season} files from the series folder")
+                    else:
+                        info_echo(f"📁 Using files from Season {season} folder")
+                
+                    # Auto-detect episode format for this season
                     season_double = detect_episode_format(files)
                     if season_double:
                         highlight_echo(f"🎬 Detected double episodes format for Season {season}")
                     else:
                         highlight_echo(f"🎬 Detected single episodes format for Season {season}")
+                
                     # Use season-specific format detection, but allow manual override
                     use_double = double if double is not None else season_double
+                elif season_mapping:
+                    error_echo(f"❌ Season {season} not found. Available seasons:")
+                    for season_num in sorted(season_mapping.keys()):
+                        highlight_echo(f"   -n {season_num}")
+                    return
                 else:
-                    error_echo("❌ Could not auto-detect season. Please specify with -n")
+                    # Single season mode, use manual flag
+                    use_double = double
+        
+            # Resolve the show
+            if not router.resolve_show(show):
+                if time_left() == 0:
+                    warning_echo(f"\n⏰ Deadline reached while looking up the show, deferred season: {season}")
+                    info_echo("🔁 Run again to continue")
                     return
-        else:
-            # Check if specified season should be skipped
-            skip_seasons_set = parse_skip_seasons(skip_seasons)
-            if season in skip_seasons_set:
-                warning_echo(f"⏭️ Season {season} is in skip list, exiting.")
+                error_echo("❌ Failed to find show with any metadata provider. Exiting.")
                 return
-            
-            highlight_echo(f"📺 Using specified season: {season}")
-            
-            # If we have season mapping, get files from specific season
-            if season_mapping and season in season_mapping:
-                season_info = season_mapping[season]
-                files = season_info['files']
-                season_path = season_info['path']
-                info_echo(f"📁 Using files from Season {season} folder")
-                
-                # Auto-detect episode format for this season
-                season_double = detect_episode_format(files)
-                if season_double:
-                    highlight_echo(f"🎬 Detected double episodes format for Season {season}")
-                else:
-                    highlight_echo(f"🎬 Detected single episodes format for Season {season}")
-                
-                # Use season-specific format detection, but allow manual override
-                use_double = double if double is not None else season_double
-            elif season_mapping:
-                error_echo(f"❌ Season {season} not found. Available seasons:")
-                for season_num in sorted(season_mapping.keys()):
-                    highlight_echo(f"   -n {season_num}")
+        
+            titles = router.iter_episode_titles(show, season)
+        
+            if verbose:
+                info_echo(f"🔍 Generating mapping with {len(files)} files, double={use_double}")
+            try:
+                mapping = generate_mapping(files, titles, use_double)
+            except DeadlineExceeded:
+                warning_echo(f"\n⏰ Deadline reached before the titles of season {season} were fetched")
                 return
-            else:
-                # Single season mode, use manual flag
-                use_double = double
-
-        # Find show URL
-        show_url = find_show_on_imdb(show)
-        if not show_url:
-            error_echo("❌ Failed to find show on IMDB. Exiting.")
-            return
+            except TruncatedSeasonError as e:
+                error_echo(f"❌ {e}")
+                return
+            if not any(mapping.values()):
+                return
+            if season_flat:
+                mapping = place_in_season_folder(mapping, season)
+            if verbose:
+                info_echo(f"📝 Generated mapping with {len(mapping)} entries")
         
-        titles = get_episode_titles(show_url, season)
+            missing_titles = sum(1 for new in mapping.values() if not new)
+            if missing_titles > 0:
+                warning_echo(f"⚠️ Missing titles for {missing_titles} files")
+                dump_config(mapping, path)
+                return
         
-        if not titles:
-            return
+            if save_config:
+                # Save configuration to file
+                dump_config(mapping, path, config_file)
+                return
         
-        if verbose:
-            info_echo(f"🔍 Generating mapping with {len(files)} files, {len(titles)} titles, double={use_double}")
-        mapping = generate_mapping(files, titles, use_double)
-        if verbose:
-            info_echo(f"📝 Generated mapping with {len(mapping)} entries")
-
-        missing_titles = sum(1 for new in mapping.values() if not new)
-        if missing_titles > 0:
-            warning_echo(f"⚠️ Missing titles for {missing_titles} files")
-            dump_config(mapping, path)
-            return
-
-        if save_config:
-            # Save configuration to file
-            dump_config(mapping, path, config_file)
-            return
-
-        if verbose:
-            preview_changes(mapping)
+            if verbose:
+                preview_changes(mapping)
         
+            if not preview:
+                if yes or click.confirm("\nOrganize files into library?" if organize else "\nRename files?"):
+                    if folder_renames:
+                        renamed = apply_folder_renames(path, folder_renames, journal)
+                        folder_renames.clear()
+                        if not renamed:
+                            return
+                        season_path = renamed_season_path(season_path, renamed_paths)
+                    try:
+                        apply_or_organize(mapping, season_path, show, season, organize, link_mode, journal,
+                                          season_scope(season_path, season, season_flat))
+                    except FolderLockedError as e:
+                        error_echo(f"❌ {e}")
+                else:
+                    warning_echo("❌ Cancelled.")
+    except BaseException:
+        # A failed or aborted run leaves the season folders alone
+        folder_renames.clear()
+        raise
+    finally:
+        # Planned folder renames still happen when no file rename was applied
+        # (nothing to rename, missing titles, a saved config, declined seasons, ...)
         if not preview:
-            if yes or click.confirm("\nRename files?"):
-                apply_mapping(mapping, path)
-            else:
-                warning_echo("❌ Cancelled.")
+            settle_folder_renames(path, folder_renames, yes, journal)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
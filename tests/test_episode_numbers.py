@@ -0,0 +1,32 @@
+import episodic
+
+
+def test_episode_zero_is_left_untouched_next_to_a_range():
+    mapping = episodic.generate_mapping(["Show.S01E00.Special.mkv", "Show.S01E01-03.mkv"], ["A", "B", "C"])
+    assert mapping == {"Show.S01E01-03.mkv": "Episode 01-03 - A and B and C.mkv"}
+
+
+def test_folder_with_only_episode_zero():
+    assert episodic.generate_mapping(["Show.S01E00.mkv"], ["A", "B", "C"]) == {}
+
+
+def test_title_buffer_has_no_negative_indexes():
+    titles = episodic.TitleBuffer(["A", "B"])
+    assert titles.get(1) == "B"
+    assert titles.get(-1) is None
+
+
+def test_episode_not_listed_yet_keeps_numbered_mapping():
+    files = ["s.S01E01.mkv", "s.S01E03.mkv", "s.S01E04.mkv", "s.S01E05.mkv"]
+    mapping = episodic.generate_mapping(files, ["a", "b", "c", "d"])
+    assert mapping == {
+        "s.S01E01.mkv": "Episode 01 - a.mkv",
+        "s.S01E03.mkv": "Episode 03 - c.mkv",
+        "s.S01E04.mkv": "Episode 04 - d.mkv",
+        "s.S01E05.mkv": "",
+    }
+
+
+def test_absolute_numbering_without_season_falls_back_to_sort_order():
+    mapping = episodic.generate_mapping(["Show - 13.mkv", "Show - 14.mkv"], ["a", "b", "c", "d"])
+    assert mapping == {"Show - 13.mkv": "Episode 01 - a.mkv", "Show - 14.mkv": "Episode 02 - b.mkv"}